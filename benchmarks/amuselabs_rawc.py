@@ -0,0 +1,201 @@
+"""Benchmark for deobfuscating AmuseLabs rawc puzzle data.
+
+Builds a corpus of synthetic but realistically shaped AmuseLabs puzzles at
+several grid sizes, obfuscates each with a known key, and times how long the
+key search takes to recover it. For each blob, the number of candidate key
+prefixes explored, how many of them survived, and the number of chunk checks
+made are reported along with the best wall time of several runs.
+
+Run from a checkout with xword-dl installed:
+
+    python benchmarks/amuselabs_rawc.py [--repeat N] [--only NAME]
+
+The exit status is nonzero if any blob fails to decode to its original data.
+"""
+
+import argparse
+import base64
+import json
+import random
+import string
+import sys
+import time
+
+from xword_dl.downloader import amuselabsdownloader as amuselabs
+
+WORDS = [
+    "".join(random.Random(i).choices(string.ascii_uppercase, k=3 + i % 7))
+    for i in range(400)
+]
+
+
+def make_puzzle(size: int, seed: int) -> dict:
+    """Returns puzzle data shaped like the JSON in an AmuseLabs rawc blob."""
+    rng = random.Random(seed)
+
+    box = [
+        [
+            "\x00" if rng.random() < 0.16 else rng.choice(string.ascii_uppercase)
+            for _ in range(size)
+        ]
+        for _ in range(size)
+    ]
+
+    # a few rebus squares and circles, as in themed Sunday puzzles
+    for _ in range(size // 5):
+        box[rng.randrange(size)][rng.randrange(size)] = rng.choice(["STAR", "ONE"])
+
+    cell_infos = [
+        {"x": rng.randrange(size), "y": rng.randrange(size), "isCircled": True}
+        for _ in range(size // 3)
+    ]
+
+    placed_words = [
+        {
+            "clueNum": n + 1,
+            "x": rng.randrange(size),
+            "y": rng.randrange(size),
+            "acrossNotDown": n % 2 == 0,
+            "word": rng.choice(WORDS),
+            "clue": {
+                "clue": " ".join(
+                    rng.choice(WORDS).lower() for _ in range(rng.randint(2, 8))
+                )
+                + rng.choice(["", " (2 wds.)", ", in a way", " <i>à la</i> “Café”"])
+            },
+        }
+        for n in range(size * size // 3)
+    ]
+
+    return {
+        "title": f"Synthetic {size}x{size} #{seed}",
+        "author": "Jane Q. Constructor",
+        "copyright": "2026 Synthetic Puzzles",
+        "w": size,
+        "h": size,
+        "publishTime": 1_790_000_000_000 + seed * 86_400_000,
+        "box": box,
+        "cellInfos": cell_infos,
+        "placedWords": placed_words,
+    }
+
+
+def obfuscate(text: str, key: list[int]) -> str:
+    """Encodes text as rawc, the inverse of deobfuscate_rawc_with_key."""
+    buffer = list(base64.b64encode(text.encode("utf-8")).decode("ascii"))
+    i = 0
+    segment_count = 0
+
+    while i < len(buffer) - 1:
+        segment_length = min(key[segment_count % len(key)], len(buffer) - i)
+        segment_count += 1
+        buffer[i : i + segment_length] = buffer[i : i + segment_length][::-1]
+        i += segment_length
+
+    return "".join(buffer)
+
+
+def build_corpus() -> list[tuple[str, str, str]]:
+    """Returns (name, original JSON, rawc) for every blob in the corpus."""
+    corpus = []
+
+    for size in (5, 15, 21, 25):
+        for seed in range(3):
+            rng = random.Random(size * 100 + seed)
+            key = [rng.randint(2, 20) for _ in range(7)]
+            text = json.dumps(make_puzzle(size, seed), ensure_ascii=False)
+            corpus.append((f"{size}x{size}-{seed}", text, obfuscate(text, key)))
+
+    # Data that doesn't start with `{"` gives the search no hint for the
+    # first key digit, so it starts from an empty prefix
+    for size in (5, 15):
+        seed = 0
+        while True:
+            rng = random.Random(size * 1000 + seed)
+            key = [rng.randint(2, 20) for _ in range(7)]
+            text = "\r\n" + json.dumps(make_puzzle(size, seed), indent=1)
+            rawc = obfuscate(text, key)
+            if not amuselabs._initial_key_prefix(rawc):
+                break
+            seed += 1
+        corpus.append((f"{size}x{size}-nohint", text, rawc))
+
+    return corpus
+
+
+def count_work(rawc: str) -> tuple[list[int] | None, int, int, int]:
+    """Runs a search, counting candidates explored, kept, and chunks checked."""
+    counts = {"candidates": 0, "kept": 0, "chunks": 0}
+
+    could_be_key_prefix = amuselabs._could_be_key_prefix
+    check_chunk = amuselabs._check_chunk
+
+    def counted_could_be_key_prefix(rawc, key_prefix):
+        counts["candidates"] += 1
+        kept = could_be_key_prefix(rawc, key_prefix)
+        counts["kept"] += kept
+        return kept
+
+    def counted_check_chunk(rawc, key_prefix, start_pos):
+        counts["chunks"] += 1
+        return check_chunk(rawc, key_prefix, start_pos)
+
+    amuselabs._could_be_key_prefix = counted_could_be_key_prefix
+    amuselabs._check_chunk = counted_check_chunk
+    try:
+        key = amuselabs.find_rawc_key(rawc)
+    finally:
+        amuselabs._could_be_key_prefix = could_be_key_prefix
+        amuselabs._check_chunk = check_chunk
+
+    return key, counts["candidates"], counts["kept"], counts["chunks"]
+
+
+def _time_search(rawc: str) -> float:
+    start = time.perf_counter()
+    amuselabs.find_rawc_key(rawc)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark deobfuscating AmuseLabs rawc puzzle data."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per blob")
+    parser.add_argument("--only", help="only run blobs whose name contains this")
+    args = parser.parse_args()
+
+    corpus = [c for c in build_corpus() if not args.only or args.only in c[0]]
+
+    print(
+        f"{'blob':<14}{'rawc':>8}{'hint':>6}{'cands':>8}{'kept':>6}"
+        f"{'chunks':>9}{'best ms':>10}"
+    )
+
+    failures = 0
+    total = 0.0
+
+    for name, text, rawc in corpus:
+        key, candidates, kept, chunks = count_work(rawc)
+
+        if not key or amuselabs.deobfuscate_rawc_with_key(rawc, key) != text:
+            print(f"{name:<14} FAILED to recover the original data")
+            failures += 1
+            continue
+
+        best = min(_time_search(rawc) for _ in range(max(args.repeat, 1)))
+        total += best
+
+        hint = "yes" if amuselabs._initial_key_prefix(rawc) else "no"
+        print(
+            f"{name:<14}{len(rawc):>8}{hint:>6}{candidates:>8}{kept:>6}"
+            f"{chunks:>9}{best * 1000:>10.1f}"
+        )
+
+    print(f"{'total':<51}{total * 1000:>10.1f}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
 import importlib
+import json
+import os
 import pkgutil
 from typing import TypeVar, Type
 
 from .basedownloader import BaseDownloader as __bd
+from ..util import CACHE_PATH
+
+try:
+    from .._version import __version__ as __version__  # type: ignore
+except ModuleNotFoundError:
+    __version__ = "0.0.0-dev"
 
 
 # FIXME: after Python 3.11 deprecation, switch to PEP 695 style generics
 T = TypeVar("T")
 
+MANIFEST_PATH = os.path.join(CACHE_PATH, "plugins.json")
+
+_manifest = None
+
 
 def __get_subclasses(cls: Type[T]) -> list[Type[T]]:
     """Recursively returns a list of subclasses of `cls` in imported namespaces."""
@@ -21,3 +33,82 @@ def get_plugins():
     for _, mod, _ in pkgutil.walk_packages(__path__):
         importlib.import_module(f".{mod}", package=__name__)
     return __get_subclasses(__bd)
+
+
+def _overrides(plugin, method_name: str) -> bool:
+    return getattr(getattr(plugin, method_name), "__func__", None) is not getattr(
+        getattr(__bd, method_name), "__func__", None
+    )
+
+
+def _plugin_entry(plugin) -> dict:
+    return {
+        "module": plugin.__module__.rsplit(".", 1)[-1],
+        "class": plugin.__name__,
+        "command": plugin.command,
+        "outlet": plugin.outlet,
+        "netloc_hints": list(plugin.netloc_hints),
+        "matches_url": _overrides(plugin, "matches_url"),
+        # embed pattern matching is only tried for the plugin that defines it,
+        # not for every subclass that inherits it
+        "matches_embed_pattern": "matches_embed_pattern" in plugin.__dict__
+        and _overrides(plugin, "matches_embed_pattern"),
+        "authenticate": _overrides(plugin, "authenticate"),
+    }
+
+
+def _fingerprint() -> str:
+    """Identifies the installed plugin modules, to invalidate a stale manifest."""
+    plugin_files = sorted(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in os.scandir(__path__[0])
+        if entry.name.endswith(".py")
+    )
+    return __version__ + ":" + ":".join(f"{n},{m},{s}" for n, m, s in plugin_files)
+
+
+def build_manifest() -> list[dict]:
+    """Imports every plugin and describes each one in a JSON-serializable list."""
+    return [_plugin_entry(plugin) for plugin in get_plugins() if plugin is not __bd]
+
+
+def get_manifest() -> list[dict]:
+    """Returns plugin descriptions without importing plugin modules, if possible.
+
+    The manifest is cached on disk and rebuilt (by importing every plugin) only
+    when the installed plugin modules have changed since it was written.
+    """
+    global _manifest
+
+    if _manifest is not None:
+        return _manifest
+
+    fingerprint = _fingerprint()
+
+    try:
+        with open(MANIFEST_PATH, "r") as f:
+            cached = json.load(f)
+        if cached.get("fingerprint") == fingerprint:
+            _manifest = cached["plugins"]
+            return _manifest
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    _manifest = build_manifest()
+
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"fingerprint": fingerprint, "plugins": _manifest}, f)
+        os.replace(tmp_path, MANIFEST_PATH)
+    except OSError:
+        pass
+
+    return _manifest
+
+
+def load_plugin(entry: dict) -> Type[__bd]:
+    """Imports the module for a single manifest entry and returns its class."""
+    module = importlib.import_module(f".{entry['module']}", package=__name__)
+    return getattr(module, entry["class"])
@@ -5,13 +5,11 @@ import time
 
 import puz
 import requests
-import xmltodict
 
 from urllib.parse import unquote
-from xml.parsers.expat import ExpatError
 
 from .basedownloader import BaseDownloader
-from ..util import XWordDLException
+from ..util import GridBuilder, XWordDLException, iterparse_xml, xml_localname
 
 
 class AMUniversalDownloader(BaseDownloader):
@@ -36,19 +34,21 @@ class AMUniversalDownloader(BaseDownloader):
         return url
 
     def fetch_data(self, solver_url):
-        attempts = 3
-        while attempts:
+        # the session retries failed responses, but the data is also sometimes
+        # served incomplete with a success status, so retry parsing it as well
+        policy = self.session.retry_policy
+        for attempt in range(policy.retries + 1):
             try:
                 res = self.session.get(solver_url)
-                xword_data = res.json()
-                break
+                return res.json()
             except json.JSONDecodeError:
-                print("Unable to download puzzle data. Trying again.", file=sys.stderr)
-                time.sleep(2)
-                attempts -= 1
-        else:
-            raise XWordDLException("Unable to download puzzle data.")
-        return xword_data
+                if attempt < policy.retries:
+                    print(
+                        "Unable to download puzzle data. Trying again.", file=sys.stderr
+                    )
+                    time.sleep(policy.backoff_delay(attempt))
+
+        raise XWordDLException("Unable to download puzzle data.")
 
     def process_clues(self, clue_list):
         """Return clue list without any end markers"""
@@ -69,17 +69,15 @@ class AMUniversalDownloader(BaseDownloader):
         puzzle.width = int(xw_data.get("Width"))
         puzzle.height = int(xw_data.get("Height"))
 
-        solution = xw_data.get("AllAnswer").replace("-", ".")
+        grid = GridBuilder()
 
-        puzzle.solution = solution
-
-        fill = ""
-        for letter in solution:
+        for letter in xw_data.get("AllAnswer").replace("-", "."):
             if letter == ".":
-                fill += "."
+                grid.add_block()
             else:
-                fill += "-"
-        puzzle.fill = fill
+                grid.add_square(letter)
+
+        grid.write(puzzle)
 
         across_clues = xw_data["AcrossClue"].splitlines()
         down_clues = self.process_clues(xw_data["DownClue"].splitlines())
@@ -166,29 +164,39 @@ class USATodayDownloader(BaseDownloader):
         return xw_data
 
     def parse_xword(self, xw_data):
-        try:
-            xw = xmltodict.parse(xw_data)["crossword"]
-        except (ExpatError, KeyError):
+        metadata = {}
+        clues = []
+
+        for element in iterparse_xml(xw_data):
+            parent = element.getparent()
+            parent_tag = xml_localname(parent) if parent is not None else ""
+
+            if parent_tag in ("across", "down"):
+                clues.append((int(element.get("cn")), unquote(element.get("c") or "")))
+                element.clear()
+            elif parent_tag == "crossword":
+                metadata[xml_localname(element)] = element.get("v")
+
+        if any(k not in metadata for k in ("Width", "Height", "AllAnswer")):
             raise XWordDLException("Puzzle data malformed, cannot parse.")
 
         puzzle = puz.Puzzle()
 
-        puzzle.title = unquote(xw.get("Title", []).get("@v") or "")
-        puzzle.author = unquote(xw.get("Author", []).get("@v") or "")
-        puzzle.copyright = unquote(xw.get("Copyright", []).get("@v") or "")
+        puzzle.title = unquote(metadata.get("Title") or "")
+        puzzle.author = unquote(metadata.get("Author") or "")
+        puzzle.copyright = unquote(metadata.get("Copyright") or "")
 
-        puzzle.width = int(xw.get("Width")["@v"])
-        puzzle.height = int(xw.get("Height")["@v"])
+        puzzle.width = int(metadata["Width"])
+        puzzle.height = int(metadata["Height"])
 
-        puzzle.solution = xw.get("AllAnswer", []).get("@v").replace("-", ".")
+        puzzle.solution = metadata["AllAnswer"].replace("-", ".")
         puzzle.fill = "".join([c if c == "." else "-" for c in puzzle.solution])
 
-        xw_clues = sorted(
-            list(xw["across"].values()) + list(xw["down"].values()),
-            key=lambda c: int(c["@cn"]),
-        )
+        # across clues are read first, and sorting is stable, so they stay
+        # ahead of down clues with the same number
+        clues.sort(key=lambda clue: clue[0])
 
-        puzzle.clues = [unquote(c.get("@c") or "") for c in xw_clues]
+        puzzle.clues = [text for _, text in clues]
 
         return puzzle
 
@@ -1,6 +1,12 @@
 import base64
+import binascii
+import concurrent.futures
 import datetime
 import json
+import multiprocessing
+import os
+import threading
+import time
 import urllib.parse
 
 import puz
@@ -9,15 +15,91 @@ import requests
 import re
 
 from bs4 import BeautifulSoup, Tag
+from bs4.filter import SoupStrainer
 
 from collections import deque
 from typing import List
 
 from .basedownloader import BaseDownloader
-from ..util import XWordDLException, unidecode
+from ..util import (
+    CACHE_PATH,
+    GridBuilder,
+    XWordDLException,
+    client,
+    unidecode,
+)
+from ..util.extract import find_script_json
+
+# The obfuscated puzzle data and picker parameters are usually assigned in a
+# script as a single-quoted string, and can be picked out without parsing it
+_RAWC_RE = re.compile(r"window\.(?:puzzleEnv\.)?rawc[^'\n]*'([^'\n]*)'")
+_RAWSPS_RE = re.compile(r"pickerParams\.rawsps[^'\n]*'([^'\n]*)'")
+
+# Date picker states fetched in this process, by picker URL, so that each set's
+# picker is fetched once rather than once per puzzle. Each picker URL has its
+# own lock, so that different sets' pickers can be fetched at the same time
+_picker_states = {}
+_picker_state_locks = {}
+_picker_state_locks_lock = threading.Lock()
+
+
+class PickerState:
+    """What a set's date picker page provides for loading puzzles in the set.
+
+    Puzzles in some sets only load with the picker's load token and a first
+    visit token derived from the session's uid cookie, so both are kept along
+    with the recent puzzles listed in the picker's streakInfo, and their IDs
+    by date."""
+
+    def __init__(self, set_name, picker_params=None, uid=None, puzzles=None):
+        self.set_name = set_name
+        self.picker_params = picker_params or {}
+        self.load_token = self.picker_params.get("loadToken")
+        self.uid = uid
+        self.puzzles = puzzles or []
+        self.by_date = _puzzles_by_date(self.puzzles)
+        self.fetched_at = time.monotonic()
+
+    @classmethod
+    def from_source(cls, picker_url: str, picker_source: str, uid=None):
+        try:
+            param_obj = find_script_json(picker_source, id="params") or {}
+        except XWordDLException:
+            param_obj = {}
+
+        rawsps_match = _RAWSPS_RE.search(picker_source)
+        rawsps = rawsps_match.group(1) if rawsps_match else param_obj.get("rawsps")
+
+        picker_params = {}
+        if rawsps:
+            picker_params = json.loads(base64.b64decode(rawsps).decode("utf-8"))
+
+        set_name = urllib.parse.parse_qs(urllib.parse.urlparse(picker_url).query).get(
+            "set", [None]
+        )[0]
+
+        return cls(set_name, picker_params, uid, param_obj.get("streakInfo"))
+
+    def puzzle_url(self, url_from_id: str, puzzle_id: str) -> str:
+        """Returns the URL to load a puzzle in this set with this state."""
+        url = url_from_id.format(puzzle_id=puzzle_id)
+
+        if self.load_token:
+            url += "&loadToken=" + self.load_token
+
+        if self.set_name and self.uid:
+            url += "&fvlt=" + _compute_fvlt(self.set_name, puzzle_id, self.uid)
+
+        return url
 
 
 class AmuseLabsDownloader(BaseDownloader):
+    netloc_hints = ("amuselabs.com",)
+
+    # seconds that a date picker's state is reused by downloaders for its set
+    # in this process (the picker-ttl setting overrides)
+    picker_ttl = 600
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -34,13 +116,18 @@ class AmuseLabsDownloader(BaseDownloader):
     @classmethod
     def matches_embed_pattern(cls, url="", page_source=""):
         if url and not page_source:
-            res = requests.get(url)
+            res = client.get(url)
             page_source = res.text
 
         if not page_source:
             return None
 
-        soup = BeautifulSoup(page_source, features="lxml")
+        # Only the tags that can point to a solver are kept from the page
+        soup = BeautifulSoup(
+            page_source,
+            features="lxml",
+            parse_only=SoupStrainer(["iframe", "script", "div"]),
+        )
 
         sources = [
             urllib.parse.urljoin(
@@ -63,7 +150,7 @@ class AmuseLabsDownloader(BaseDownloader):
                 elif parsed_url.path.endswith("date-picker"):
                     queries = urllib.parse.parse_qs(parsed_url.query)
                     if "idx" in queries:
-                        res = requests.get(embed_src)
+                        res = client.get(embed_src)
                         index = int(queries["idx"][0]) - 1
                         puzzle_id = cls._select_puzzle_at_index_from_date_picker(
                             picker_src=res.text, index=index
@@ -100,15 +187,10 @@ class AmuseLabsDownloader(BaseDownloader):
                 "This outlet does not support finding the latest crossword."
             )
 
-        res = self.session.get(self.picker_url)
-
-        self.id = self._select_puzzle_at_index_from_date_picker(
-            picker_src=res.text, index=0
-        )
+        picker_state = self.get_picker_state()
+        self.id = _select_puzzle_id(picker_state.puzzles, index=0)
 
-        self.get_and_add_picker_token(res.text)
-
-        return self.find_puzzle_url_from_id(self.id)
+        return self.find_puzzle_url_from_id(self.id, picker_state)
 
     @staticmethod
     def _select_puzzle_at_index_from_date_picker(picker_src=None, index=0):
@@ -117,77 +199,138 @@ class AmuseLabsDownloader(BaseDownloader):
                 "Bad call to puzzle selection function. Report this as a bug."
             )
 
-        soup = BeautifulSoup(picker_src, "html.parser")
+        param_obj = find_script_json(picker_src, id="params") or {}
 
-        param_tag = soup.find("script", id="params")
-        param_obj = (
-            json.loads(param_tag.string or "") if isinstance(param_tag, Tag) else {}
-        )
+        return _select_puzzle_id(param_obj.get("streakInfo", []), index=index)
 
-        puzzles = param_obj.get("streakInfo", [])
+    def get_picker_state(self) -> PickerState:
+        """Returns the state of this outlet's date picker, fetching it if needed.
 
-        if not puzzles:
-            raise XWordDLException("Unable to find puzzles data from picker page.")
+        The state is shared by the downloaders for a set in this process, so
+        that finding puzzles for a range of dates fetches the picker once."""
+        if self.picker_url is None:
+            raise XWordDLException(
+                "No picker URL was available. Please report this as a bug."
+            )
 
-        selected_id = puzzles[index].get("puzzleDetails", []).get("puzzleId")
+        ttl = float(self.settings.get("picker_ttl", self.picker_ttl))
 
-        if not selected_id:
-            raise XWordDLException(
-                "Unexpected puzzle metadata format. Please report this as a bug."
+        with _picker_state_locks_lock:
+            lock = _picker_state_locks.setdefault(self.picker_url, threading.Lock())
+
+        # the lock is held while fetching, so that concurrent downloads from
+        # the same set wait for one fetch of the picker
+        with lock:
+            picker_state = _picker_states.get(self.picker_url)
+
+            if not picker_state or time.monotonic() - picker_state.fetched_at >= ttl:
+                res = self.cached_get(self.picker_url)
+                res.raise_for_status()
+
+                picker_state = PickerState.from_source(
+                    self.picker_url, res.text, uid=self.session.cookies.get("uid")
+                )
+                _picker_states[self.picker_url] = picker_state
+
+                index_puzzles(self.picker_url, picker_state.by_date)
+
+        # the first visit token is only accepted with the uid it was made from,
+        # which a state fetched with another session has to bring along
+        if picker_state.uid and "uid" not in self.session.cookies:
+            self.session.cookies.set(
+                "uid",
+                picker_state.uid,
+                domain=urllib.parse.urlparse(self.picker_url).netloc,
             )
 
-        return selected_id
+        return picker_state
 
-    def get_and_add_picker_token(self, picker_source=None):
+    def find_by_date(self, dt):
         if self.picker_url is None:
+            return super().find_by_date(dt)
+
+        picker_state = self.get_picker_state()
+        puzzle_id = self.find_indexed_id(dt, picker_state)
+        puzzle_id = puzzle_id or self.guess_id_from_date(dt)
+
+        if not puzzle_id:
             raise XWordDLException(
-                "No picker URL was available. Please report this as a bug."
+                f"No puzzle found for {dt:%Y-%m-%d}. Only puzzles that "
+                f"{self.outlet} has listed recently can be found by date."
             )
-        if not picker_source:
-            res = self.session.get(self.picker_url)
-            picker_source = res.text
-
-        if "pickerParams.rawsps" in picker_source:
-            rawsps = next(
-                (
-                    line.strip().split("'")[1]
-                    for line in picker_source.splitlines()
-                    if "pickerParams.rawsps" in line
-                ),
-                None,
-            )
-        else:
-            soup = BeautifulSoup(picker_source, "html.parser")
-            param_tag = soup.find("script", id="params")
-            param_obj = (
-                json.loads(param_tag.string or "") if isinstance(param_tag, Tag) else {}
-            )
-            rawsps = param_obj.get("rawsps", None)
 
-        # FIXME: should this raise an exception when not defined?
-        if rawsps:
-            picker_params = json.loads(base64.b64decode(rawsps).decode("utf-8"))
-            token = picker_params.get("loadToken", None)
-            if token:
-                self.url_from_id += "&loadToken=" + token
-
-        set_name = (
-            urllib.parse.parse_qs(urllib.parse.urlparse(self.picker_url).query).get(
-                "set", [None]
-            )[0]
-            if self.picker_url
-            else None
-        )
-        uid = self.session.cookies.get("uid")
-        if set_name and self.id and uid:
-            assert self.url_from_id is not None
-            self.url_from_id += "&fvlt=" + _compute_fvlt(set_name, self.id, uid)
+        self.id = puzzle_id
+
+        return self.find_puzzle_url_from_id(self.id, picker_state)
+
+    def find_indexed_id(self, dt, picker_state=None) -> str | None:
+        """Returns the ID of the puzzle listed by the date picker for a date.
+
+        The picker only lists recent puzzles, but the puzzles from every
+        listing seen are indexed, so older puzzles can be found too."""
+        if self.picker_url is None:
+            return None
+
+        date_key = dt.strftime("%Y-%m-%d")
+        picker_state = picker_state or self.get_picker_state()
+
+        return picker_state.by_date.get(date_key) or get_indexed_puzzles(
+            self.picker_url
+        ).get(date_key)
+
+    def guess_id_from_date(self, dt) -> str | None:
+        """Subclass method to guess the AmuseLabs id for a date, if possible.
+
+        This is used to find puzzles by date that the date picker hasn't
+        listed, for outlets whose puzzle ids follow a pattern of dates.
+        """
+
+        return None
+
+    def available_dates(self, dates):
+        """Returns the dates with a puzzle, according to the date picker.
 
-    def find_puzzle_url_from_id(self, puzzle_id):
+        The picker lists every puzzle for a stretch of recent dates, so dates
+        in that stretch that it doesn't list are skipped. Earlier dates are
+        kept if their puzzle has been indexed or its id can be guessed.
+        """
+        dates = super().available_dates(dates)
+
+        if self.picker_url is None or not dates:
+            return dates
+
+        try:
+            listed = self.get_picker_state().by_date
+        except (requests.RequestException, XWordDLException, ValueError):
+            return dates
+
+        if not listed:
+            return dates
+
+        first_listed = min(listed)
+        indexed = get_indexed_puzzles(self.picker_url)
+        available = []
+
+        for dt in dates:
+            date_key = dt.strftime("%Y-%m-%d")
+            if date_key in listed:
+                available.append(dt)
+            elif date_key < first_listed and (
+                date_key in indexed or self.guess_id_from_date(dt)
+            ):
+                available.append(dt)
+
+        return available
+
+    def find_puzzle_url_from_id(self, puzzle_id, picker_state=None):
         if self.url_from_id is None:
             raise XWordDLException(
                 "No URL for puzzle IDs was available. Please report this as a bug."
             )
+
+        if picker_state is not None:
+            return picker_state.puzzle_url(self.url_from_id, puzzle_id)
+
         return self.url_from_id.format(puzzle_id=puzzle_id)
 
     def guess_date_from_id(self, puzzle_id):
@@ -215,43 +358,53 @@ class AmuseLabsDownloader(BaseDownloader):
         ):
             raise XWordDLException(f"Could not fetch solver at {solver_url}")
 
-        if "window.rawc" in res.text or "window.puzzleEnv.rawc" in res.text:
-            rawc = next(
-                (
-                    line.strip().split("'")[1]
-                    for line in res.text.splitlines()
-                    if ("window.rawc" in line or "window.puzzleEnv.rawc" in line)
-                ),
-                None,
-            )
+        rawc_match = _RAWC_RE.search(res.text)
+        if rawc_match:
+            rawc = rawc_match.group(1)
         else:
             # As of 2023-12-01, it looks like the rawc value is sometimes
-            # given as a parameter in an embedded json blob, which means
-            # parsing the page
-            soup = BeautifulSoup(res.text, "html.parser")
-            if not isinstance(soup, Tag):
-                raise XWordDLException(
-                    "Crossword puzzle not found. Could not parse HTML."
-                )
-
-            script_tag = soup.find("script", id="params")
-            if not isinstance(script_tag, Tag):
+            # given as a parameter in an embedded json blob
+            param_obj = find_script_json(res.text, id="params")
+            if param_obj is None:
                 raise XWordDLException(
                     "Crossword puzzle not found. Could not find script tag."
                 )
 
-            rawc = json.loads(script_tag.string or "").get("rawc") or ""
+            rawc = param_obj.get("rawc") or ""
 
         if not rawc:
             raise XWordDLException("Unable to find rawc object in AmuseLabs page")
 
-        xword_data = json.loads(deobfuscate_rawc(rawc))
+        xword_data = json.loads(self.deobfuscate(rawc, solver_url))
 
         if not xword_data:
             raise XWordDLException("Unable to decode AmuseLabs rawc object")
 
         return xword_data
 
+    def deobfuscate(self, rawc: str, solver_url: str) -> str:
+        """Deobfuscate rawc data, trying the last key found for its set first."""
+        key = get_cached_rawc_key(solver_url)
+        if key:
+            deobfuscated = deobfuscate_rawc_with_key(rawc, key)
+            if _is_json(deobfuscated):
+                return deobfuscated
+
+        processes = int(self.settings.get("rawc_search_processes", 1))
+        executor = get_rawc_search_pool(processes) if processes > 1 else None
+
+        try:
+            key = find_rawc_key(rawc, executor=executor)
+        except concurrent.futures.BrokenExecutor:
+            key = find_rawc_key(rawc)
+
+        if not key:
+            return "{}"
+
+        cache_rawc_key(solver_url, key)
+
+        return deobfuscate_rawc_with_key(rawc, key)
+
     def parse_xword(self, xw_data):
         puzzle = puz.Puzzle()
         puzzle.title = xw_data.get("title", "").strip()
@@ -266,45 +419,30 @@ class AmuseLabsDownloader(BaseDownloader):
 
         markup_data = xw_data.get("cellInfos", "")
 
-        circled = [
+        circled = {
             (square["x"], square["y"]) for square in markup_data if square["isCircled"]
-        ]
+        }
 
-        solution = ""
-        fill = ""
-        markup = b""
-        rebus_board = []
-        rebus_index = 0
-        rebus_table = ""
+        grid = GridBuilder()
 
         box = xw_data["box"]
         for row_num in range(xw_data.get("h")):
             for col_num, column in enumerate(box):
                 cell = column[row_num]
                 if cell == "\x00":
-                    solution += "."
-                    fill += "."
-                    markup += b"\x00"
-                    rebus_board.append(0)
+                    grid.add_block()
                 elif len(cell) == 1:
-                    solution += cell
-                    fill += "-"
-                    markup += b"\x80" if (col_num, row_num) in circled else b"\x00"
-                    rebus_board.append(0)
+                    grid.add_square(cell, circled=(col_num, row_num) in circled)
                 elif not cell:
-                    solution += "X"
-                    fill += "-"
-                    markup += b"\x00"
-                    rebus_board.append(0)
+                    grid.add_square("X")
                 else:
-                    solution += cell[0]
-                    fill += "-"
-                    rebus_board.append(rebus_index + 1)
-                    rebus_table += "{:2d}:{};".format(rebus_index, unidecode(cell))
-                    rebus_index += 1
+                    grid.add_square(
+                        cell[0],
+                        circled=(col_num, row_num) in circled,
+                        rebus=unidecode(cell),
+                    )
 
-        puzzle.solution = solution
-        puzzle.fill = fill
+        grid.write(puzzle)
 
         if all(c in [".", "X"] for c in puzzle.solution):
             puzzle.solution_state = 0x0002
@@ -321,20 +459,6 @@ class AmuseLabsDownloader(BaseDownloader):
 
         puzzle.clues.extend(clues)
 
-        has_markup = b"\x80" in markup
-        has_rebus = any(rebus_board)
-
-        if has_markup:
-            puzzle.extensions[b"GEXT"] = markup
-            puzzle._extensions_order.append(b"GEXT")
-            puzzle.markup()
-
-        if has_rebus:
-            puzzle.extensions[b"GRBS"] = bytes(rebus_board)
-            puzzle.extensions[b"RTBL"] = rebus_table.encode(puz.ENCODING)
-            puzzle._extensions_order.extend([b"GRBS", b"RTBL"])
-            puzzle.rebus()
-
         return puzzle
 
     def pick_filename(self, puzzle, **kwargs):
@@ -343,6 +467,41 @@ class AmuseLabsDownloader(BaseDownloader):
         return super().pick_filename(puzzle, **kwargs)
 
 
+def _puzzles_by_date(puzzles: list) -> dict[str, str]:
+    """Returns the puzzle ids in a date picker's streakInfo by publish date."""
+    by_date = {}
+
+    for puzzle in puzzles:
+        details = puzzle.get("puzzleDetails") or {}
+        puzzle_id = details.get("puzzleId")
+
+        try:
+            timestamp = int(details.get("publishTime", 0)) // 1000
+        except (TypeError, ValueError):
+            continue
+
+        # the most recently listed puzzle for a date comes first
+        if puzzle_id and timestamp:
+            date_key = datetime.date.fromtimestamp(timestamp).isoformat()
+            by_date.setdefault(date_key, puzzle_id)
+
+    return by_date
+
+
+def _select_puzzle_id(puzzles: list, index: int = 0) -> str:
+    if not puzzles:
+        raise XWordDLException("Unable to find puzzles data from picker page.")
+
+    selected_id = puzzles[index].get("puzzleDetails", {}).get("puzzleId")
+
+    if not selected_id:
+        raise XWordDLException(
+            "Unexpected puzzle metadata format. Please report this as a bug."
+        )
+
+    return selected_id
+
+
 def _compute_fvlt(set_name: str, puzzle_id: str, uid: str) -> str:
     """Compute the fvlt (first-visit load token) required by the AmuseLabs puzzle viewer.
 
@@ -366,6 +525,58 @@ def _compute_fvlt(set_name: str, puzzle_id: str, uid: str) -> str:
 # these were adapted from https://github.com/jpd236/kotwords/ and
 # used here under the terms of that project's Apache license
 # https://github.com/jpd236/kotwords/blob/master/LICENSE
+# Bytes that can't appear in UTF-8 encoded JSON: control characters other than
+# whitespace, and bytes that are never valid in UTF-8
+_INVALID_BYTES = bytes(
+    b
+    for b in range(256)
+    if (b < 32 and b not in (0x09, 0x0A, 0x0D)) or b in (0xC0, 0xC1) or b >= 0xF5
+)
+
+
+def _check_chunk(rawc: str, key_prefix: List[int], start_pos: int) -> tuple[int, bool]:
+    """
+    Check the chunk of rawc starting at start_pos for the given key prefix.
+
+    Returns the position just past the chunk, and whether its Base64 portion
+    decodes to bytes that could be valid UTF-8. The result depends only on the
+    key prefix and start_pos, so it can be reused across spacings.
+    """
+    try:
+        pos = start_pos
+        key_index = 0
+        chunk = []
+
+        # Assemble a chunk by reversing segments of specified lengths
+        while key_index < len(key_prefix) and pos < len(rawc):
+            chunk_length = min(key_prefix[key_index], len(rawc) - pos)
+            chunk.append(rawc[pos : pos + chunk_length][::-1])
+            pos += chunk_length
+            key_index += 1
+
+        chunk_str = "".join(chunk)
+
+        # Align to 4-byte Base64 boundaries
+        base64_start = ((start_pos + 3) // 4) * 4 - start_pos
+        base64_end = (pos // 4) * 4 - start_pos
+
+        if base64_start >= len(chunk_str) or base64_end <= base64_start:
+            return pos, True
+
+        b64_chunk = chunk_str[base64_start:base64_end]
+
+        try:
+            decoded = binascii.a2b_base64(b64_chunk)
+        except ValueError:
+            return pos, False
+
+        # Check for invalid UTF-8 bytes, by deleting them all at once and
+        # seeing if anything was deleted
+        return pos, len(decoded.translate(None, _INVALID_BYTES)) == len(decoded)
+    except Exception:
+        return len(rawc), False
+
+
 def is_valid_key_prefix(rawc: str, key_prefix: List[int], spacing: int) -> bool:
     """
     Determine if the given key prefix could be valid.
@@ -374,57 +585,50 @@ def is_valid_key_prefix(rawc: str, key_prefix: List[int], spacing: int) -> bool:
     1. Base64 portions decode successfully
     2. Decoded bytes contain only valid UTF-8 (no invalid continuation bytes)
     """
-    try:
-        pos = 0
-        chunk = []
+    pos = 0
 
-        while pos < len(rawc):
-            start_pos = pos
-            key_index = 0
-
-            # Assemble a chunk by reversing segments of specified lengths
-            while key_index < len(key_prefix) and pos < len(rawc):
-                chunk_length = min(key_prefix[key_index], len(rawc) - pos)
-                chunk.append(rawc[pos : pos + chunk_length][::-1])
-                pos += chunk_length
-                key_index += 1
-
-            chunk_str = "".join(chunk)
-
-            # Align to 4-byte Base64 boundaries
-            base64_start = ((start_pos + 3) // 4) * 4 - start_pos
-            base64_end = (pos // 4) * 4 - start_pos
-
-            if base64_start >= len(chunk_str) or base64_end <= base64_start:
-                chunk.clear()
-                pos += spacing
-                continue
-
-            b64_chunk = chunk_str[base64_start:base64_end]
-
-            try:
-                decoded = base64.b64decode(b64_chunk)
-            except Exception:
-                return False
-
-            # Check for invalid UTF-8 bytes
-            for byte in decoded:
-                byte_val = byte if isinstance(byte, int) else ord(byte)
-                if (
-                    (byte_val < 32 and byte_val not in (0x09, 0x0A, 0x0D))
-                    or byte_val == 0xC0
-                    or byte_val == 0xC1
-                    or byte_val >= 0xF5
-                ):
-                    return False
+    while pos < len(rawc):
+        pos, valid = _check_chunk(rawc, key_prefix, pos)
+        if not valid:
+            return False
+        pos += spacing
 
-            pos += spacing
-            chunk.clear()
+    return True
 
-        return True
-    except Exception:
+
+def _is_valid_key_prefix_for_any_spacing(
+    rawc: str, key_prefix: List[int], min_spacing: int, max_spacing: int
+) -> bool:
+    """
+    Determine if the given key prefix could be valid with any spacing in range.
+
+    Equivalent to calling is_valid_key_prefix for each spacing, but each chunk
+    is only checked once, however many spacings place a chunk at its position.
+    """
+    checked_chunks = {}
+
+    def check_chunk(pos: int) -> tuple[int, bool]:
+        if pos not in checked_chunks:
+            checked_chunks[pos] = _check_chunk(rawc, key_prefix, pos)
+        return checked_chunks[pos]
+
+    # Every spacing starts with the same chunk, and most wrong prefixes are
+    # ruled out by it, so check it before walking the whole string
+    if rawc and not check_chunk(0)[1]:
         return False
 
+    for spacing in range(min_spacing, max_spacing + 1):
+        pos = 0
+        while pos < len(rawc):
+            pos, valid = check_chunk(pos)
+            if not valid:
+                break
+            pos += spacing
+        else:
+            return True
+
+    return False
+
 
 def deobfuscate_rawc_with_key(rawc: str, key: List[int]) -> str:
     """
@@ -459,10 +663,7 @@ def deobfuscate_rawc_with_key(rawc: str, key: List[int]) -> str:
         return ""
 
 
-def deobfuscate_rawc(rawc: str) -> str:
-    """
-    Brute-force deobfuscate obfuscated crossword puzzle data.
-    """
+def _initial_key_prefix(rawc: str) -> List[int]:
     # Heuristic: find "ye" or "we" which appear at the start of Base64-encoded JSON
     # In particular, these strings (reversed) correspond to `{"` and `{\n`
     ye_pos = rawc.find("ye")
@@ -473,36 +674,226 @@ def deobfuscate_rawc(rawc: str) -> str:
 
     first_key_digit = min(ye_pos, we_pos) + 2
 
-    # Initialize BFS queue
-    if first_key_digit > 20:
-        candidate_queue = deque([[]])
-    else:
-        candidate_queue = deque([[first_key_digit]])
+    return [] if first_key_digit > 20 else [first_key_digit]
+
+
+def _could_be_key_prefix(rawc: str, key_prefix: List[int]) -> bool:
+    remaining_digits = 7 - len(key_prefix)
+    min_spacing = 2 * remaining_digits
+    max_spacing = 20 * remaining_digits
+
+    # Test if any spacing within bounds produces valid output
+    return _is_valid_key_prefix_for_any_spacing(
+        rawc, key_prefix, min_spacing, max_spacing
+    )
+
+
+def _search_rawc_key(
+    rawc: str, key_prefix: List[int], cancelled=None
+) -> List[int] | None:
+    """
+    Breadth-first search for a key starting with key_prefix.
+
+    If a cancelled event is provided, the search gives up once it's set.
+    """
+    candidate_queue = deque([key_prefix])
 
     while candidate_queue:
+        if cancelled is not None and cancelled.is_set():
+            return None
+
         candidate_key_prefix = candidate_queue.popleft()
 
         if len(candidate_key_prefix) == 7:
-            deobfuscated = deobfuscate_rawc_with_key(rawc, candidate_key_prefix)
-            try:
-                json.loads(deobfuscated)
-                return deobfuscated
-            except (json.JSONDecodeError, ValueError):
-                continue
+            if _is_json(deobfuscate_rawc_with_key(rawc, candidate_key_prefix)):
+                return candidate_key_prefix
+            continue
 
         # Expand by trying next digits (2-20)
         for next_digit in range(2, 21):
             new_candidate = candidate_key_prefix + [next_digit]
 
-            remaining_digits = 7 - len(new_candidate)
-            min_spacing = 2 * remaining_digits
-            max_spacing = 20 * remaining_digits
-
-            # Test if any spacing within bounds produces valid output
-            if any(
-                is_valid_key_prefix(rawc, new_candidate, spacing)
-                for spacing in range(min_spacing, max_spacing + 1)
-            ):
+            if _could_be_key_prefix(rawc, new_candidate):
                 candidate_queue.append(new_candidate)
 
-    return "{}"
+    return None
+
+
+def _search_rawc_key_branch(
+    rawc: str, key_prefix: List[int], cancelled=None
+) -> List[int] | None:
+    if not _could_be_key_prefix(rawc, key_prefix):
+        return None
+
+    return _search_rawc_key(rawc, key_prefix, cancelled)
+
+
+def find_rawc_key(
+    rawc: str, executor: concurrent.futures.Executor | None = None
+) -> List[int] | None:
+    """
+    Brute-force search for the key that deobfuscates crossword puzzle data.
+
+    If an executor is provided, the branches of the search for each possible
+    next key digit are searched in it concurrently, and the first key found
+    is returned without waiting for the other branches, which are told to
+    stop so that they don't keep the executor busy.
+    """
+    key_prefix = _initial_key_prefix(rawc)
+
+    if executor is None:
+        return _search_rawc_key(rawc, key_prefix)
+
+    cancelled = _new_rawc_search_event()
+
+    futures = [
+        executor.submit(
+            _search_rawc_key_branch, rawc, key_prefix + [next_digit], cancelled
+        )
+        for next_digit in range(2, 21)
+    ]
+
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            key = future.result()
+            if key:
+                return key
+    finally:
+        cancelled.set()
+        for future in futures:
+            future.cancel()
+
+    return None
+
+
+def deobfuscate_rawc(rawc: str) -> str:
+    """
+    Brute-force deobfuscate obfuscated crossword puzzle data.
+    """
+    key = find_rawc_key(rawc)
+
+    return deobfuscate_rawc_with_key(rawc, key) if key else "{}"
+
+
+def _is_json(text: str) -> bool:
+    try:
+        json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        return False
+
+    return True
+
+
+# Publishers seem to keep the same key for a puzzle set for a long time, so
+# keys that were found are kept and tried first for later puzzles in the set
+RAWC_KEY_CACHE_PATH = os.path.join(CACHE_PATH, "amuselabs-keys.json")
+_rawc_key_cache_lock = threading.Lock()
+
+# Date pickers only list recent puzzles, so the puzzle ids by date from every
+# listing seen are kept, to find puzzles by date after they're no longer listed
+PUZZLE_INDEX_PATH = os.path.join(CACHE_PATH, "amuselabs-puzzles.json")
+_puzzle_index_lock = threading.Lock()
+
+
+def _set_cache_id(url: str) -> str:
+    """Identifies the AmuseLabs host and puzzle set of a solver or picker URL."""
+    url_components = urllib.parse.urlparse(url)
+    set_name = urllib.parse.parse_qs(url_components.query).get("set", [""])[0]
+
+    return f"{url_components.netloc}/{set_name or url_components.path}"
+
+
+def _read_cache_file(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache_file(path: str, data: dict):
+    try:
+        os.makedirs(CACHE_PATH, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def get_cached_rawc_key(solver_url: str) -> List[int] | None:
+    """Returns the key last found for puzzles in a solver URL's set, if any."""
+    with _rawc_key_cache_lock:
+        return _read_cache_file(RAWC_KEY_CACHE_PATH).get(_set_cache_id(solver_url))
+
+
+def cache_rawc_key(solver_url: str, key: List[int]):
+    """Remembers the key for puzzles in a solver URL's set."""
+    with _rawc_key_cache_lock:
+        keys = _read_cache_file(RAWC_KEY_CACHE_PATH)
+        keys[_set_cache_id(solver_url)] = key
+        _write_cache_file(RAWC_KEY_CACHE_PATH, keys)
+
+
+def get_indexed_puzzles(picker_url: str) -> dict[str, str]:
+    """Returns the ids of the puzzles indexed for a picker URL's set, by date."""
+    with _puzzle_index_lock:
+        return _read_cache_file(PUZZLE_INDEX_PATH).get(_set_cache_id(picker_url), {})
+
+
+def index_puzzles(picker_url: str, puzzles_by_date: dict[str, str]):
+    """Adds puzzle ids by date to the index for a picker URL's set."""
+    with _puzzle_index_lock:
+        index = _read_cache_file(PUZZLE_INDEX_PATH)
+        set_index = index.setdefault(_set_cache_id(picker_url), {})
+
+        if all(set_index.get(k) == v for k, v in puzzles_by_date.items()):
+            return
+
+        set_index.update(puzzles_by_date)
+        _write_cache_file(PUZZLE_INDEX_PATH, index)
+
+
+# The key search is CPU-bound, so it can be spread across processes. The pools
+# are shared by every download in this process, so that downloads running
+# concurrently in batch mode share the available cores. Worker processes are
+# started by a fork server (or spawned where there is none) rather than forked,
+# since forking a process while other threads are running can deadlock
+_rawc_search_pools = {}
+_rawc_search_manager = None
+_rawc_search_pool_lock = threading.Lock()
+
+
+def _rawc_search_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+
+    return multiprocessing.get_context("spawn")
+
+
+def get_rawc_search_pool(processes: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Returns a process pool for rawc key searches, creating it if needed.
+
+    The number of processes is capped at the number of CPUs, and searches
+    asking for the same number of processes share a pool."""
+    processes = max(1, min(int(processes), os.cpu_count() or 1))
+
+    with _rawc_search_pool_lock:
+        if processes not in _rawc_search_pools:
+            _rawc_search_pools[processes] = concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes, mp_context=_rawc_search_context()
+            )
+
+        return _rawc_search_pools[processes]
+
+
+def _new_rawc_search_event():
+    """Returns an event that can tell a search's worker processes to stop."""
+    global _rawc_search_manager
+
+    with _rawc_search_pool_lock:
+        if _rawc_search_manager is None:
+            _rawc_search_manager = _rawc_search_context().Manager()
+
+    return _rawc_search_manager.Event()
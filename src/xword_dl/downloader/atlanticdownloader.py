@@ -16,11 +16,8 @@ class AtlanticDownloader(AmuseLabsDownloader):
             "https://cdn3.amuselabs.com/atlantic/crossword?id={puzzle_id}&set=atlantic"
         )
 
-    def find_by_date(self, dt):
-        url_formatted_date = dt.strftime("%Y%m%d")
-        self.id = "atlantic_" + url_formatted_date
-
-        return self.find_puzzle_url_from_id(self.id)
+    def guess_id_from_date(self, dt):
+        return "atlantic_" + dt.strftime("%Y%m%d")
 
     def guess_date_from_id(self, puzzle_id):
         try:
@@ -1,3 +1,5 @@
+import os
+import time
 import urllib.parse
 from datetime import datetime
 
@@ -5,6 +7,8 @@ import requests
 from puz import Puzzle
 
 from ..util import (
+    client,
+    find_saved_puzzles,
     read_config_values,
     remove_invalid_chars_from_filename,
     sanitize_for_puzfile,
@@ -21,7 +25,24 @@ class BaseDownloader:
     outlet = ""
     outlet_prefix = None
 
-    def __init__(self, **kwargs):
+    # domains that matches_url may accept, so that URL lookups can import only
+    # the plugins that might match instead of every plugin in the package
+    netloc_hints: tuple[str, ...] = ()
+
+    # how many puzzles from this outlet may be downloaded at once when
+    # fetching a range of dates (the max-concurrent-downloads setting overrides)
+    max_concurrent_downloads = 4
+
+    # seconds that finding and downloading a puzzle may take altogether (the
+    # download-timeout setting overrides)
+    download_timeout = 300
+
+    # seconds that a page fetched with cached_get is reused without checking
+    # with the server, or None to follow its headers (the cache-ttl setting
+    # overrides)
+    cache_ttl: float | None = None
+
+    def __init__(self, session: client.Session | None = None, **kwargs):
         self.date = kwargs.get("date", None)
         self.netloc = urllib.parse.urlparse(kwargs.get("url", "")).netloc
 
@@ -43,19 +64,50 @@ class BaseDownloader:
 
         self.settings.update(kwargs)
 
-        self.session = requests.Session()
+        # a session may be shared by several downloaders for the same outlet
+        self.session = session or client.new_session()
+        self.session.retry_policy = client.RetryPolicy.from_settings(self.settings)
+        self.session.timeout = (
+            float(self.settings.get("connect_timeout", client.DEFAULT_CONNECT_TIMEOUT)),
+            float(self.settings.get("read_timeout", client.DEFAULT_READ_TIMEOUT)),
+        )
+
+        self._deadline = None
         self.session.headers.update(self.settings.get("headers", {}))
         self.session.cookies.update(self.settings.get("cookies", {}))
 
+    def deadline(self):
+        """Returns a context in which this puzzle's requests must finish.
+
+        The time allowed is shared by every use of the context, starting from
+        the first, so that finding a puzzle and downloading it have a single
+        budget between them."""
+        budget = self.settings.get("download_timeout", self.download_timeout)
+
+        if self._deadline is None and budget:
+            self._deadline = time.monotonic() + float(budget)
+
+        return client.deadline(self._deadline)
+
+    def cached_get(self, url: str, **kwargs) -> requests.Response:
+        """GET a slowly changing page, such as an index, through the HTTP cache.
+
+        The cache-ttl setting overrides how many seconds a cached response is
+        reused before it is revalidated, and http-cache can turn it off."""
+        if not self.settings.get("http_cache", True):
+            return self.session.get(url, **kwargs)
+
+        return client.cached_get(
+            self.session,
+            url,
+            ttl=self.settings.get("cache_ttl", self.cache_ttl),
+            **kwargs,
+        )
+
     def pick_filename(self, puzzle: Puzzle, **kwargs) -> str:
-        tokens = {
-            "outlet": self.outlet or "",
-            "prefix": self.outlet_prefix or "",
-            "title": puzzle.title or "",
-            "author": puzzle.author or "",
-            "cmd": getattr(self, "command", self.netloc or ""),
-            "netloc": self.netloc or "",
-        }
+        tokens = self._filename_tokens(
+            title=puzzle.title or "", author=puzzle.author or ""
+        )
 
         tokens = {t: kwargs[t] if t in kwargs else tokens[t] for t in tokens}
 
@@ -68,27 +120,82 @@ class BaseDownloader:
             template += " - %Y%m%d" if date else ""
             template += " - %title" if tokens.get("title") else ""
 
+        template = self._fill_filename_template(template, tokens, date)
+
+        if not template.endswith(".puz"):
+            template += ".puz"
+
+        return template
+
+    def _filename_tokens(self, title="", author="") -> dict[str, str]:
+        return {
+            "outlet": self.outlet or "",
+            "prefix": self.outlet_prefix or "",
+            "title": title,
+            "author": author,
+            "cmd": getattr(self, "command", self.netloc or ""),
+            "netloc": self.netloc or "",
+        }
+
+    def _fill_filename_template(self, template: str, tokens: dict, date) -> str:
         for token in tokens.keys():
-            replacement = kwargs.get(token, tokens[token])
-            replacement = remove_invalid_chars_from_filename(replacement)
+            replacement = remove_invalid_chars_from_filename(tokens[token])
             template = template.replace("%" + token, replacement)
 
         if date:
             template = date.strftime(template)
 
-        if not template.endswith(".puz"):
-            template += ".puz"
-
         template = " ".join(template.split())
 
         return template
 
+    def find_saved_file(self) -> str | None:
+        """Returns the name of a file this puzzle was already saved to, if any.
+
+        This is checked before downloading, so it needs the puzzle's date to
+        be known in advance. If the filename template doesn't depend on the
+        puzzle's title or author, the filename is checked directly. Otherwise,
+        the index of saved puzzles is searched for a file from this outlet and
+        date in the directory that this puzzle would be saved to.
+        """
+        if not self.date:
+            return None
+
+        template = self.settings.get("filename") or ""
+        tokens = self._filename_tokens()
+        content_tokens = ("%title", "%author")
+
+        if template and not any(t in template for t in content_tokens):
+            filename = self._fill_filename_template(template, tokens, self.date)
+            if not filename.endswith(".puz"):
+                filename += ".puz"
+            return filename if os.path.exists(filename) else None
+
+        directory = os.path.dirname(template)
+
+        if not self.command or any(t in directory for t in content_tokens):
+            return None
+
+        directory = os.path.abspath(
+            self._fill_filename_template(directory, tokens, self.date)
+        )
+
+        return next(
+            (
+                filename
+                for filename in find_saved_puzzles(self.command, self.date)
+                if os.path.dirname(filename) == directory and os.path.exists(filename)
+            ),
+            None,
+        )
+
     def download(self, url: str) -> Puzzle:
         """Download, parse, and return a puzzle at a given URL."""
 
-        solver_url = self.find_solver(url)
-        xword_data = self.fetch_data(solver_url)
-        puzzle = self.parse_xword(xword_data)
+        with self.deadline():
+            solver_url = self.find_solver(url)
+            xword_data = self.fetch_data(solver_url)
+            puzzle = self.parse_xword(xword_data)
 
         puzzle = sanitize_for_puzfile(
             puzzle, preserve_html=self.settings.get("preserve_html", False)
@@ -135,6 +242,23 @@ class BaseDownloader:
         representing the URL to the puzzle."""
         raise NotImplementedError
 
+    def available_dates(self, dates: list[datetime]) -> list[datetime]:
+        """Returns the dates, out of a list, for which there may be a puzzle.
+
+        This is used to plan downloads for a range of dates. Subclasses for
+        outlets that list their puzzles for many dates at once override this,
+        so that only dates with a puzzle are downloaded."""
+        return [dt for dt in dates if self.publishes_on(dt)]
+
+    @classmethod
+    def publishes_on(cls, dt: datetime) -> bool:
+        """Returns whether this outlet could have a puzzle on a given date.
+
+        Subclasses for outlets with a fixed publishing schedule override this,
+        so that dates known to have no puzzle can be skipped without a request.
+        """
+        return True
+
     @classmethod
     def matches_url(cls, url_components: urllib.parse.ParseResult) -> bool:
         """Returns whether this plugin can download the provided URL."""
@@ -6,6 +6,7 @@ class BillboardDownloader(AmuseLabsDownloader):
     command = "bill"
     outlet = "Billboard"
     outlet_prefix = "Billboard"
+    netloc_hints = ("www.billboard.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1,10 +1,15 @@
 import puz
-import requests
 import urllib.parse
-import xmltodict
 from bs4 import BeautifulSoup, Tag
 
 from .basedownloader import BaseDownloader
+from ..util import (
+    GridBuilder,
+    XWordDLException,
+    client,
+    iterparse_xml,
+    xml_localname,
+)
 
 
 class CrosswordCompilerDownloader(BaseDownloader):
@@ -23,61 +28,105 @@ class CrosswordCompilerDownloader(BaseDownloader):
         return res.content
 
     def parse_xword(self, xw_data, enumeration=True):
-        xw = xmltodict.parse(xw_data)
-        xw_root = xw.get("crossword-compiler") or xw["crossword-compiler-applet"]
-        xw_puzzle = xw_root["rectangular-puzzle"]
-        xw_metadata = xw_puzzle["metadata"]
-        xw_grid = xw_puzzle["crossword"]["grid"]
-
         puzzle = puz.Puzzle()
 
-        puzzle.title = xw_metadata.get("title") or ""
-        puzzle.author = xw_metadata.get("creator") or ""
-        puzzle.copyright = xw_metadata.get("copyright") or ""
+        metadata = {}
+        width = height = 0
+        squares = []
+        clues = []
+
+        # The document is read one element at a time, and each cell and clue
+        # is stored as soon as it's read, so no tree of the whole puzzle is built
+        for element in iterparse_xml(xw_data):
+            tag = xml_localname(element)
+
+            if tag == "cell":
+                squares.append(
+                    (
+                        int(element.get("y")),
+                        int(element.get("x")),
+                        element.get("type") == "block",
+                        element.get("solution", "."),
+                        element.get("background-shape") == "circle",
+                    )
+                )
+                element.clear()
+
+            elif tag == "clue":
+                clue_format = element.get("format")
+                clues.append(
+                    (
+                        int(element.get("number")),
+                        _element_text(element)
+                        + (f" ({clue_format})" if clue_format and enumeration else ""),
+                    )
+                )
+                element.clear()
 
-        puzzle.width = int(xw_grid["@width"])
-        puzzle.height = int(xw_grid["@height"])
+            elif tag == "grid":
+                width = int(element.get("width"))
+                height = int(element.get("height"))
 
-        solution = ""
-        fill = ""
-        markup = b""
+            elif tag == "metadata":
+                metadata = {
+                    xml_localname(e): _element_text(e)
+                    for e in element
+                    if isinstance(e.tag, str)
+                }
 
-        cells = {(int(cell["@x"]), int(cell["@y"])): cell for cell in xw_grid["cell"]}
+        puzzle.title = metadata.get("title") or ""
+        puzzle.author = metadata.get("creator") or ""
+        puzzle.copyright = metadata.get("copyright") or ""
 
-        for y in range(1, puzzle.height + 1):
-            for x in range(1, puzzle.width + 1):
-                cell = cells[(x, y)]
-                solution += cell.get("@solution", ".")
-                fill += "." if cell.get("@type") == "block" else "-"
-                markup += (
-                    b"\x80" if (cell.get("@background-shape") == "circle") else b"\x00"
-                )
+        puzzle.width = width
+        puzzle.height = height
 
-        puzzle.solution = solution
-        puzzle.fill = fill
+        if len(squares) != width * height:
+            raise XWordDLException("Puzzle data malformed, cannot parse.")
 
-        xw_clues = xw_puzzle["crossword"]["clues"]
+        # cells are usually listed by column, so put them in reading order
+        squares.sort()
 
-        all_clues = xw_clues[0]["clue"] + xw_clues[1]["clue"]
+        grid = GridBuilder()
 
-        clues = [
-            c.get("#text", "")
-            + (f" ({c.get('@format', '')})" if c.get("@format") and enumeration else "")
-            for c in sorted(all_clues, key=lambda x: int(x["@number"]))
-        ]
+        for _, _, is_block, solution, circled in squares:
+            if is_block:
+                grid.add_block()
+            else:
+                grid.add_square(solution, circled=circled)
 
-        puzzle.clues = clues
+        grid.write(puzzle)
 
-        has_markup = b"\x80" in markup
+        # across clues come first in the document, and sorting is stable, so
+        # they stay ahead of down clues with the same number
+        clues.sort(key=lambda clue: clue[0])
 
-        if has_markup:
-            puzzle.extensions[b"GEXT"] = markup
-            puzzle._extensions_order.append(b"GEXT")
-            puzzle.markup()
+        puzzle.clues = [text for _, text in clues]
 
         return puzzle
 
 
+def _element_text(element) -> str:
+    return _element_markup(element).strip()
+
+
+def _element_markup(element) -> str:
+    """Returns an element's content, keeping inline markup such as <i>.
+
+    Child elements are written back as tags without their namespace, to be
+    converted along with other markup when the puzzle is cleaned up. Comments
+    and processing instructions are left out."""
+    parts = [element.text or ""]
+
+    for child in element:
+        if isinstance(child.tag, str):
+            name = xml_localname(child)
+            parts.append(f"<{name}>{_element_markup(child)}</{name}>")
+        parts.append(child.tail or "")
+
+    return "".join(parts)
+
+
 class CrosswordCompilerJSEncodedDownloader(CrosswordCompilerDownloader):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -85,7 +134,7 @@ class CrosswordCompilerJSEncodedDownloader(CrosswordCompilerDownloader):
     @classmethod
     def matches_embed_pattern(cls, url="", page_source=""):
         if url and not page_source:
-            res = requests.get(url)
+            res = client.get(url)
             page_source = res.text
 
         if not page_source:
@@ -97,7 +146,7 @@ class CrosswordCompilerJSEncodedDownloader(CrosswordCompilerDownloader):
             s for s in soup.find_all("script") if isinstance(s, Tag) and s.get("src")
         ]:
             js_url = urllib.parse.urljoin(url, str(script.get("src")))
-            res = requests.get(js_url, headers={"User-Agent": "xword-dl"})
+            res = client.get(js_url, headers={"User-Agent": "xword-dl"})
             if res.text.startswith("var CrosswordPuzzleData"):
                 return js_url
 
@@ -1,18 +1,18 @@
 import urllib.parse
 
-import dateparser
 import requests
 
 from bs4 import BeautifulSoup
 
 from .amuselabsdownloader import AmuseLabsDownloader
-from ..util import XWordDLException
+from ..util import XWordDLException, parse_date
 
 
 class CrosswordClubDownloader(AmuseLabsDownloader):
     command = "club"
     outlet = "Crossword Club"
     outlet_prefix = "Crossword Club"
+    netloc_hints = ("crosswordclub.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -39,7 +39,7 @@ class CrosswordClubDownloader(AmuseLabsDownloader):
 
     def find_latest(self):
         index_url = "https://crosswordclub.com/puzzles/"
-        index_res = requests.get(index_url)
+        index_res = self.cached_get(index_url)
         index_soup = BeautifulSoup(index_res.text, "html.parser")
 
         latest_url = next(
@@ -55,7 +55,7 @@ class CrosswordClubDownloader(AmuseLabsDownloader):
         return latest_url
 
     def find_solver(self, url):
-        res = requests.get(url)
+        res = self.session.get(url)
 
         try:
             res.raise_for_status()
@@ -77,7 +77,7 @@ class CrosswordClubDownloader(AmuseLabsDownloader):
 
         pubdate_url_component = url.split("/")[-1] or url.split("/")[-2]
         pubdate = pubdate_url_component.replace("-", " ")
-        pubdate_dt = dateparser.parse(pubdate)
+        pubdate_dt = parse_date(pubdate)
         self.date = pubdate_dt
 
         return super().find_solver(self.find_puzzle_url_from_id(self.id))
@@ -1,8 +1,7 @@
 import datetime
 
-import dateparser.search
-
 from .amuselabsdownloader import AmuseLabsDownloader
+from ..util import search_date
 
 
 class DailyBeastDownloader(AmuseLabsDownloader):
@@ -22,14 +21,12 @@ class DailyBeastDownloader(AmuseLabsDownloader):
         puzzle = super().parse_xword(xw_data)
 
         # Daily Beast puzzle IDs don't include the date.
-        # This pulls it out of the puzzle title (with periods removed because
-        # they mess with the date parser)
-
-        possible_dates = dateparser.search.search_dates(puzzle.title.replace(".", ""))
+        # Unless it was selected by date, this pulls it out of the puzzle
+        # title (with periods removed because they mess with the date parser)
 
-        if possible_dates:
-            self.date = possible_dates[-1][1]
-        else:
-            self.date = datetime.datetime.today()
+        if not self.date:
+            self.date = (
+                search_date(puzzle.title.replace(".", "")) or datetime.datetime.today()
+            )
 
         return puzzle
@@ -1,5 +1,4 @@
 import datetime
-import requests
 import urllib.parse
 
 from .compilerdownloader import CrosswordCompilerDownloader
@@ -23,7 +22,7 @@ class DailyPopDownloader(CrosswordCompilerDownloader):
         self.session.headers.update(self.settings["headers"])
 
     def get_api_key(self):
-        res = requests.get(
+        res = self.session.get(
             "http://dailypopcrosswordsweb.puzzlenation.com/crosswordSetup.js"
         )
 
@@ -13,6 +13,7 @@ class DerStandardDownloader(AmuseLabsDownloader):
     command = "std"
     outlet = "Der Standard"
     outlet_prefix = "Der Standard"
+    netloc_hints = ("derstandard.at",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -35,7 +36,7 @@ class DerStandardDownloader(AmuseLabsDownloader):
         index_url = (
             "https://www.derstandard.at/lifestyle/raetsel-sudoku/kreuzwortraetsel"
         )
-        index_res = self.session.get(index_url, timeout=10)
+        index_res = self.cached_get(index_url, timeout=10)
         index_soup = BeautifulSoup(index_res.text, "lxml")
 
         latest_fragment = next(a for a in index_soup.select(".teaser-inner a"))["href"]
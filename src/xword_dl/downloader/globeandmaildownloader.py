@@ -17,6 +17,7 @@ class GlobeAndMailDownloader(CrosswordCompilerDownloader):
     # other Compiler children.
     outlet = "The Globe And Mail (Cryptic)"
     outlet_prefix = "Globe And Mail"
+    netloc_hints = ("theglobeandmail.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -43,6 +44,10 @@ class GlobeAndMailDownloader(CrosswordCompilerDownloader):
             else self.latest_published_date(datetime.datetime.today())
         )
 
+    @classmethod
+    def publishes_on(cls, dt):
+        return dt.weekday() != 6
+
     def latest_published_date(self, dt):
         return dt if dt.weekday() != 6 else dt - datetime.timedelta(1)
 
@@ -3,17 +3,18 @@ import json
 import re
 
 import puz
-import requests
 
 from bs4 import BeautifulSoup, Tag
 
 from .basedownloader import BaseDownloader
-from ..util import XWordDLException
+from ..util import GridBuilder, XWordDLException
+from ..util.extract import find_tag_attrs
 
 
 class GuardianDownloader(BaseDownloader):
     outlet = "Guardian"
     outlet_prefix = "Guardian"
+    netloc_hints = ("theguardian.com",)
 
     def __init__(self, **kwargs):
         super().__init__(inherit_settings="guardian", **kwargs)
@@ -21,7 +22,7 @@ class GuardianDownloader(BaseDownloader):
         self.landing_page = "https://www.theguardian.com/crosswords"
 
     def find_latest(self):
-        res = requests.get(self.landing_page)
+        res = self.cached_get(self.landing_page)
         soup = BeautifulSoup(res.text, "html.parser")
 
         xword_link_re = re.compile(r"/crosswords/\w+/\d+")
@@ -39,15 +40,14 @@ class GuardianDownloader(BaseDownloader):
         return url
 
     def fetch_data(self, solver_url):
-        res = requests.get(solver_url)
-        soup = BeautifulSoup(res.text, "html.parser")
+        res = self.session.get(solver_url)
 
-        xw_json = soup.find("gu-island", attrs={"name": "CrosswordComponent"})
-        if not isinstance(xw_json, Tag):
+        xw_attrs = find_tag_attrs(res.text, "gu-island", name="CrosswordComponent")
+        if xw_attrs is None:
             raise XWordDLException("Could not find crossword in solver data.")
 
-        xw_json_str = xw_json.get("props")
-        if not isinstance(xw_json_str, str):
+        xw_json_str = xw_attrs.get("props")
+        if not xw_json_str:
             raise XWordDLException("Could not get JSON from solver data.")
 
         xw_data = json.loads(xw_json_str).get("data")
@@ -80,17 +80,17 @@ class GuardianDownloader(BaseDownloader):
                     else (pos[0], pos[1] + 1)
                 )
 
-        solution = ""
-        fill = ""
+        grid = GridBuilder()
 
         for y in range(puzzle.height):
             for x in range(puzzle.width):
                 sol_at_space = grid_dict.get((x, y), ".")
-                solution += sol_at_space
-                fill += "." if sol_at_space == "." else "-"
+                if sol_at_space == ".":
+                    grid.add_block()
+                else:
+                    grid.add_square(sol_at_space)
 
-        puzzle.solution = solution
-        puzzle.fill = fill
+        grid.write(puzzle)
 
         clues = [
             e.get("clue")
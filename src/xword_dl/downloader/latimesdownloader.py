@@ -1,8 +1,7 @@
 import datetime
 
-import dateparser
-
 from .amuselabsdownloader import AmuseLabsDownloader
+from ..util import parse_date
 
 
 class LATimesDownloader(AmuseLabsDownloader):
@@ -28,15 +27,10 @@ class LATimesDownloader(AmuseLabsDownloader):
             pass
 
     def guess_date_from_puzzle_title(self, title):
-        self.date = dateparser.parse(title.split(",", maxsplit=1)[-1].strip())
-
-    def find_by_date(self, dt):
-        url_formatted_date = dt.strftime("%y%m%d")
-        self.id = "tca" + url_formatted_date
-
-        self.get_and_add_picker_token()
+        self.date = parse_date(title.split(",", maxsplit=1)[-1].strip())
 
-        return self.find_puzzle_url_from_id(self.id)
+    def guess_id_from_date(self, dt):
+        return "tca" + dt.strftime("%y%m%d")
 
     def pick_filename(self, puzzle, **kwargs):
         if not self.date and self.id:
@@ -70,14 +64,12 @@ class LATimesMiniDownloader(LATimesDownloader):
         )
 
     def guess_date_from_puzzle_title(self, title):
-        self.date = dateparser.parse(title)
+        self.date = parse_date(title)
+
+    def guess_id_from_date(self, dt):
+        return f"latimes-mini-{dt:%Y%m%d}"
 
     def find_by_date(self, dt):
         self.date = dt
 
-        url_formatted_date = dt.strftime("%Y%m%d")
-        self.id = f"latimes-mini-{url_formatted_date}"
-
-        self.get_and_add_picker_token()
-
-        return self.find_puzzle_url_from_id(self.id)
+        return super().find_by_date(dt)
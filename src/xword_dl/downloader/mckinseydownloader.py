@@ -1,12 +1,10 @@
 import urllib.parse
 
-import dateparser
-
 from bs4 import BeautifulSoup
 from requests.exceptions import RequestException
 
 from .amuselabsdownloader import AmuseLabsDownloader
-from ..util import XWordDLException
+from ..util import XWordDLException, parse_date
 
 
 class McKinseyDownloader(AmuseLabsDownloader):
@@ -17,6 +15,7 @@ class McKinseyDownloader(AmuseLabsDownloader):
     # Testing with curl showed results similar to https://github.com/curl/curl/issues/18608
     outlet = "The McKinsey Crossword"
     outlet_prefix = "McKinsey"
+    netloc_hints = ("mckinsey.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -112,7 +111,7 @@ class McKinseyDownloader(AmuseLabsDownloader):
             raise XWordDLException("Cannot find puzzle at {}.".format(url))
 
         pubdate = url.split("/")[-1].replace("-", " ").capitalize()
-        pubdate_dt = dateparser.parse(pubdate)
+        pubdate_dt = parse_date(pubdate)
         self.date = pubdate_dt
 
         return self.find_puzzle_url_from_id(self.id)
@@ -23,13 +23,8 @@ class NewsdayDownloader(AmuseLabsDownloader):
         except (IndexError, ValueError):
             pass
 
-    def find_by_date(self, dt):
-        url_formatted_date = dt.strftime("%Y%m%d")
-        self.id = "Creators_WEB_" + url_formatted_date
-
-        self.get_and_add_picker_token()
-
-        return self.find_puzzle_url_from_id(self.id)
+    def guess_id_from_date(self, dt):
+        return "Creators_WEB_" + dt.strftime("%Y%m%d")
 
     def parse_xword(self, xw_data):
         self.guess_date_from_id(self.id)
@@ -1,21 +1,19 @@
 import datetime
-import json
 import re
 import urllib.parse
 
-import dateparser
 import requests
 
-from bs4 import BeautifulSoup, Tag
-
 from .puzzmodownloader import PuzzmoDownloader
-from ..util import XWordDLException
+from ..util import XWordDLException, parse_date
+from ..util.extract import find_script_json, find_tag_attrs
 
 
 class NewYorkerDownloader(PuzzmoDownloader):
     command = "tny"
     outlet = "New Yorker"
     outlet_prefix = "New Yorker"
+    netloc_hints = ("newyorker.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -42,18 +40,15 @@ class NewYorkerDownloader(PuzzmoDownloader):
 
     def find_latest(self, search_string="/crossword/"):
         url = "https://www.newyorker.com/puzzles-and-games-dept/crossword"
-        res = self.session.get(url)
+        res = self.cached_get(url)
         if not res.ok:
             raise XWordDLException("Could not fetch latest crossword URL.")
 
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        json_tag = soup.find("script", attrs={"type": "application/ld+json"})
-        if not isinstance(json_tag, Tag):
+        metadata = find_script_json(res.text, type="application/ld+json")
+        if metadata is None:
             raise XWordDLException("Could not find metadata tag for latest crossword.")
 
-        json_str = json_tag.get_text()
-        puzzle_list = json.loads(json_str).get("itemListElement", {})
+        puzzle_list = metadata.get("itemListElement", {})
         latest_url = next(
             (item for item in puzzle_list if search_string in item.get("url", "")), {}
         ).get("url")
@@ -81,19 +76,16 @@ class NewYorkerDownloader(PuzzmoDownloader):
             raise XWordDLException(f"Puzzle ID not found on {url}")
         puzzle_id = m.groups()[0]
 
-        soup = BeautifulSoup(res.text, features="lxml")
-
         theme_supra = "Today’s theme: "
-        desc = soup.find("meta", attrs={"property": "og:description"})
-        if isinstance(desc, Tag):
-            desc = desc.get("content", "")
-            if isinstance(desc, str):
-                if desc.startswith(theme_supra):
-                    self.theme_title = desc[len(theme_supra) :].rstrip(".")
-
-        published_time = soup.find("time")
-        if isinstance(published_time, Tag):
-            datetime_attr = str(published_time.get("datetime"))
+        desc_attrs = find_tag_attrs(res.text, "meta", property="og:description")
+        if desc_attrs is not None:
+            desc = desc_attrs.get("content", "")
+            if desc.startswith(theme_supra):
+                self.theme_title = desc[len(theme_supra) :].rstrip(".")
+
+        time_attrs = find_tag_attrs(res.text, "time")
+        if time_attrs is not None:
+            datetime_attr = str(time_attrs.get("datetime"))
             self.date = datetime.datetime.fromisoformat(datetime_attr)
 
         return urllib.parse.urljoin(self.api_endpoint, puzzle_id)
@@ -129,7 +121,7 @@ class NewYorkerDownloader(PuzzmoDownloader):
             supra, main = puzzle.title.split(":", 1)
             if self.theme_title:
                 main = main.rsplit(" - ")[0]
-            if supra == boilerplate_supra and dateparser.parse(main):
+            if supra == boilerplate_supra and parse_date(main):
                 title = self.theme_title
             else:
                 title = main.strip()
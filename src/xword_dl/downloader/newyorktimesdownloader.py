@@ -1,4 +1,5 @@
 import datetime
+import threading
 import urllib.parse
 
 import puz
@@ -6,13 +7,35 @@ import requests
 from getpass import getpass
 
 from .basedownloader import BaseDownloader
-from ..util import XWordDLException, join_bylines, update_config_file, unidecode
+from ..util import (
+    GridBuilder,
+    XWordDLException,
+    client,
+    join_bylines,
+    update_config_file,
+    unidecode,
+)
+
+# The NYT-S token in use, shared by every NYT downloader in the process so that
+# a new token from logging in is reused by the others instead of logging in
+# again for each one
+_nyts_token = None
+_nyts_token_lock = threading.Lock()
 
 
 class NewYorkTimesDownloader(BaseDownloader):
     command = "nyt"
     outlet = "New York Times"
     outlet_prefix = "NY Times"
+    netloc_hints = ("nytimes.com",)
+
+    # the listing of puzzle metadata by date, and this downloader's puzzles'
+    # publish_type in it
+    puzzle_list_url = "https://www.nytimes.com/svc/crosswords/v3/null/puzzles.json"
+    publish_type = "daily"
+
+    # days of puzzles requested from the listing at once
+    puzzle_list_days = 31
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -28,12 +51,10 @@ class NewYorkTimesDownloader(BaseDownloader):
         self.headers = {}
         self.cookies = {}
 
-        username = self.settings.get("username")
-        password = self.settings.get("password")
+        nyts_token = _nyts_token or self.settings.get("NYT_S")
 
-        if username and password:
-            self.authenticate(username, password)
-        nyts_token = self.settings.get("NYT_S")
+        if not nyts_token and self.can_reauthenticate():
+            nyts_token = self.refresh_token(rejected_token=None)
 
         if not nyts_token:
             raise XWordDLException(
@@ -57,7 +78,7 @@ class NewYorkTimesDownloader(BaseDownloader):
         password = password or getpass("Password: ")
 
         try:
-            res = requests.post(
+            res = client.post(
                 "https://myaccount.nytimes.com/svc/ios/v2/login",
                 data={"login": username, "password": password},
                 headers={
@@ -83,6 +104,26 @@ class NewYorkTimesDownloader(BaseDownloader):
         else:
             raise XWordDLException("NYT-S cookie not found.")
 
+        return nyts_token
+
+    def can_reauthenticate(self) -> bool:
+        return bool(self.settings.get("username") and self.settings.get("password"))
+
+    def refresh_token(self, rejected_token: str | None) -> str:
+        """Logs in with the stored username and password and returns the token.
+
+        If another downloader has already replaced rejected_token since it
+        was used, its new token is returned instead of logging in again."""
+        global _nyts_token
+
+        with _nyts_token_lock:
+            if not _nyts_token or _nyts_token == rejected_token:
+                _nyts_token = self.authenticate(
+                    self.settings.get("username"), self.settings.get("password")
+                )
+
+            return _nyts_token
+
     def parse_date_from_url(self, url):
         path = urllib.parse.urlparse(url).path
         date_string = "".join(path.split("/")[-3:])
@@ -92,7 +133,7 @@ class NewYorkTimesDownloader(BaseDownloader):
     def find_latest(self):
         oracle = "https://www.nytimes.com/svc/crosswords/v2/oracle/daily.json"
 
-        res = requests.get(oracle)
+        res = self.cached_get(oracle)
         puzzle_date = res.json()["results"]["current"]["print_date"]
 
         url = self.url_from_date.format(puzzle_date)
@@ -102,6 +143,52 @@ class NewYorkTimesDownloader(BaseDownloader):
     def find_by_date(self, dt):
         return self.url_from_date.format(dt.strftime("%Y-%m-%d"))
 
+    def list_puzzles(self, start, end, sort_order="asc") -> list[dict]:
+        """Returns listed metadata for puzzles published from start to end."""
+        res = self.cached_get(
+            self.puzzle_list_url,
+            params={
+                "publish_type": self.publish_type,
+                "sort_order": sort_order,
+                "sort_by": "print_date",
+                "date_start": start.strftime("%Y-%m-%d"),
+                "date_end": end.strftime("%Y-%m-%d"),
+            },
+        )
+        res.raise_for_status()
+
+        return res.json().get("results") or []
+
+    def available_dates(self, dates):
+        """Returns the dates with a puzzle, according to the puzzle listing.
+
+        The listing is requested for a month of dates at a time, instead of
+        requesting each date's puzzle to find out whether it exists. If the
+        listing can't be read, or has no puzzles at all, every date is tried.
+        """
+        if not dates:
+            return dates
+
+        listed_dates = set()
+        start, end = min(dates), max(dates)
+
+        try:
+            while start <= end:
+                window_end = min(
+                    start + datetime.timedelta(days=self.puzzle_list_days - 1), end
+                )
+                listed_dates.update(
+                    p["print_date"] for p in self.list_puzzles(start, window_end)
+                )
+                start = window_end + datetime.timedelta(days=1)
+        except (requests.RequestException, ValueError, KeyError):
+            return super().available_dates(dates)
+
+        if not listed_dates:
+            return super().available_dates(dates)
+
+        return [dt for dt in dates if dt.strftime("%Y-%m-%d") in listed_dates]
+
     def find_solver(self, url):
         if not url.endswith(".json"):
             url = self.find_by_date(self.parse_date_from_url(url))
@@ -109,7 +196,12 @@ class NewYorkTimesDownloader(BaseDownloader):
         return url
 
     def fetch_data(self, solver_url):
-        res = requests.get(solver_url, cookies=self.cookies)
+        res = self.session.get(solver_url, cookies=self.cookies)
+
+        # A stored token may have expired, so log in again and retry once
+        if res.status_code == 403 and self.can_reauthenticate():
+            self.cookies["NYT-S"] = self.refresh_token(self.cookies.get("NYT-S"))
+            res = self.session.get(solver_url, cookies=self.cookies)
 
         try:
             res.raise_for_status()
@@ -144,22 +236,15 @@ class NewYorkTimesDownloader(BaseDownloader):
         if xw_data.get("notes"):
             puzzle.notes = xw_data.get("notes")[0]["text"]
 
-        solution = ""
-        fill = ""
-        markup = b""
-        rebus_board = []
-        rebus_index = 0
-        rebus_table = ""
+        grid = GridBuilder()
+
+        for square in xw_data["body"][0]["cells"]:
+            circled = square.get("type", 1) != 1
 
-        for idx, square in enumerate(xw_data["body"][0]["cells"]):
             if not square:
-                solution += "."
-                fill += "."
-                rebus_board.append(0)
-            elif square and len(square.get("answer", "")) == 1:
-                solution += square["answer"]
-                fill += "-"
-                rebus_board.append(0)
+                grid.add_block()
+            elif len(square.get("answer", "")) == 1:
+                grid.add_square(square["answer"], circled=circled)
             else:
                 try:
                     suitable_answer = unidecode(
@@ -170,27 +255,11 @@ class NewYorkTimesDownloader(BaseDownloader):
                         "Unable to parse puzzle JSON. Possibly something .puz incompatible"
                     )
 
-                solution += suitable_answer[0]
-                fill += "-"
-                rebus_board.append(rebus_index + 1)
-                rebus_table += "{:2d}:{};".format(rebus_index, suitable_answer)
-                rebus_index += 1
-
-            markup += b"\x00" if square.get("type", 1) == 1 else b"\x80"
-
-        puzzle.solution = solution
-        puzzle.fill = fill
-
-        if b"\x80" in markup:
-            puzzle.extensions[b"GEXT"] = markup
-            puzzle._extensions_order.append(b"GEXT")
-            puzzle.markup()
+                grid.add_square(
+                    suitable_answer[0], circled=circled, rebus=suitable_answer
+                )
 
-        if any(rebus_board):
-            puzzle.extensions[b"GRBS"] = bytes(rebus_board)
-            puzzle.extensions[b"RTBL"] = rebus_table.encode(puz.ENCODING)
-            puzzle._extensions_order.extend([b"GRBS", b"RTBL"])
-            puzzle.rebus()
+        grid.write(puzzle)
 
         clue_list = xw_data["body"][0]["clues"]
         clue_list.sort(key=lambda c: (int(c["label"]), c["direction"]))
@@ -212,6 +281,7 @@ class NewYorkTimesVarietyDownloader(NewYorkTimesDownloader):
     command = "nytv"
     outlet = "New York Times Variety"
     outlet_prefix = "NY Times Variety"
+    publish_type = "variety"
 
     def __init__(self, **kwargs):
         super().__init__(inherit_settings="nyt", **kwargs)
@@ -242,6 +312,7 @@ class NewYorkTimesMidiDownloader(NewYorkTimesDownloader):
     command = "nytd"
     outlet = "New York Times Midi"
     outlet_prefix = "NY Times Midi"
+    publish_type = "midi"
 
     def __init__(self, **kwargs):
         super().__init__(inherit_settings="nyt", **kwargs)
@@ -257,7 +328,7 @@ class NewYorkTimesMidiDownloader(NewYorkTimesDownloader):
     def find_latest(self):
         oracle = "https://www.nytimes.com/svc/crosswords/v2/oracle/midi.json"
 
-        res = requests.get(oracle)
+        res = self.cached_get(oracle)
         puzzle_date = res.json()["results"]["current"]["print_date"]
 
         url = self.url_from_date.format(puzzle_date)
@@ -269,6 +340,7 @@ class NewYorkTimesMiniDownloader(NewYorkTimesDownloader):
     command = "nytm"
     outlet = "New York Times Mini"
     outlet_prefix = "NY Times Mini"
+    publish_type = "mini"
 
     def __init__(self, **kwargs):
         super().__init__(inherit_settings="nyt", **kwargs)
@@ -284,7 +356,7 @@ class NewYorkTimesMiniDownloader(NewYorkTimesDownloader):
     def find_latest(self):
         oracle = "https://www.nytimes.com/svc/crosswords/v2/oracle/mini.json"
 
-        res = requests.get(oracle)
+        res = self.cached_get(oracle)
         puzzle_date = res.json()["results"]["current"]["print_date"]
 
         url = self.url_from_date.format(puzzle_date)
@@ -296,6 +368,7 @@ class NewYorkTimesBonusDownloader(NewYorkTimesDownloader):
     command = "nytb"
     outlet = "New York Times Bonus"
     outlet_prefix = "NY Times Bonus"
+    publish_type = "bonus"
 
     def __init__(self, **kwargs):
         super().__init__(inherit_settings="nyt", **kwargs)
@@ -310,20 +383,11 @@ class NewYorkTimesBonusDownloader(NewYorkTimesDownloader):
 
     def find_latest(self):
         today = datetime.date.today()
-        q = "https://www.nytimes.com/svc/crosswords/v3/null/puzzles.json"
-        res = requests.get(
-            q,
-            params={
-                "publish_type": "bonus",
-                "sort_order": "desc",
-                "sort_by": "print_date",
-                "date_start": f"{today.year}-01-01",
-                "date_end": f"{today.year}-12-31",
-            },
+        results = self.list_puzzles(
+            today.replace(month=1, day=1),
+            today.replace(month=12, day=31),
+            sort_order="desc",
         )
-        res.raise_for_status()
-
-        results = res.json().get("results", [])
 
         if not results:
             raise XWordDLException("No bonus puzzles found for this year.")
@@ -1,12 +1,10 @@
 import re
 import urllib.parse
 
-import dateparser
-
 from bs4 import BeautifulSoup, Tag
 
 from .amuselabsdownloader import AmuseLabsDownloader
-from ..util import XWordDLException
+from ..util import XWordDLException, parse_date
 
 
 class ObserverDownloader(AmuseLabsDownloader):
@@ -18,7 +16,7 @@ class ObserverDownloader(AmuseLabsDownloader):
         self.article_url_string = ""
 
     def find_latest(self):
-        res = self.session.get(self.landing_page_url)
+        res = self.cached_get(self.landing_page_url)
         soup = BeautifulSoup(res.text, features="lxml")
 
         links = [
@@ -43,7 +41,7 @@ class ObserverDownloader(AmuseLabsDownloader):
 
         guessed_date_match = re.search(r"\((.+)\)", puzzle.title)
         if guessed_date_match:
-            self.date = dateparser.parse(guessed_date_match.groups()[0])
+            self.date = parse_date(guessed_date_match.groups()[0])
 
         return puzzle
 
@@ -52,6 +50,7 @@ class EverymanDownloader(ObserverDownloader):
     command = "ever"
     outlet = "Observer"
     outlet_prefix = "Observer"
+    netloc_hints = ("observer.co.uk",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -71,6 +70,7 @@ class SpeedyDownloader(ObserverDownloader):
     command = "spdy"
     outlet = "Observer"
     outlet_prefix = "Observer"
+    netloc_hints = ("observer.co.uk",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1,13 +1,26 @@
+import concurrent.futures
 import datetime
+import threading
+import time
 
 import puz
 
 from .basedownloader import BaseDownloader
-from ..util import XWordDLException
+from ..util import GridBuilder, XWordDLException
+
+# Puzzle lists fetched in this process, by list URL, as the time they were
+# fetched, the list, and the first puzzle in the list for each date
+_puzzle_lists = {}
+_puzzle_lists_lock = threading.Lock()
 
 
 class PrincetonianBaseDownloader(BaseDownloader):
     BASE_URL = "https://crossword.dailyprincetonian.com"
+    netloc_hints = ("crossword.dailyprincetonian.com",)
+
+    # the puzzle list is reused for this long, both in this process and on
+    # disk, so that downloading a range of dates fetches it once
+    cache_ttl = 900
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -17,9 +30,30 @@ class PrincetonianBaseDownloader(BaseDownloader):
         return f"{self.BASE_URL}/api/crosswords?mini={str(self._mini).lower()}"
 
     def _get_puzzle_list(self):
-        res = self.session.get(self._list_url())
-        res.raise_for_status()
-        return res.json()
+        return self._get_puzzle_index()[0]
+
+    def _get_puzzle_index(self) -> tuple[list, dict]:
+        url = self._list_url()
+        ttl = float(self.settings.get("cache_ttl", self.cache_ttl))
+
+        # the lock is held while fetching, so that concurrent downloads wait
+        # for one fetch of the list instead of each making their own
+        with _puzzle_lists_lock:
+            fetched = _puzzle_lists.get(url)
+            if fetched and time.monotonic() - fetched[0] < ttl:
+                return fetched[1], fetched[2]
+
+            res = self.cached_get(url)
+            res.raise_for_status()
+            puzzles = res.json()
+
+            by_date = {}
+            for puzzle in puzzles:
+                by_date.setdefault(puzzle["date"][:10], puzzle)
+
+            _puzzle_lists[url] = (time.monotonic(), puzzles, by_date)
+
+        return puzzles, by_date
 
     def find_latest(self):
         puzzles = self._get_puzzle_list()
@@ -30,31 +64,42 @@ class PrincetonianBaseDownloader(BaseDownloader):
         return f"{self.BASE_URL}/api/crosswords/{latest['id']}"
 
     def find_by_date(self, dt):
-        puzzles = self._get_puzzle_list()
+        _, by_date = self._get_puzzle_index()
         target = dt.strftime("%Y-%m-%d")
-        for puzzle in puzzles:
-            if puzzle["date"].startswith(target):
-                self.date = dt
-                return f"{self.BASE_URL}/api/crosswords/{puzzle['id']}"
-        raise XWordDLException(f"No puzzle found for {target}.")
+
+        puzzle = by_date.get(target)
+        if not puzzle:
+            raise XWordDLException(f"No puzzle found for {target}.")
+
+        self.date = dt
+        return f"{self.BASE_URL}/api/crosswords/{puzzle['id']}"
 
     def find_solver(self, url):
         if "api/crosswords" not in url:
             return self.find_latest()
         return url
 
+    def _get_json(self, url):
+        # this runs in a worker thread, which needs the deadline set again
+        with self.deadline():
+            return self.session.get(url).json()
+
     def fetch_data(self, solver_url):
         puzzle_id = solver_url.rstrip("/").split("/")[-1]
+        puzzle_url = f"{self.BASE_URL}/api/crosswords/{puzzle_id}"
 
-        meta = self.session.get(f"{self.BASE_URL}/api/crosswords/{puzzle_id}").json()
-        clues = self.session.get(
-            f"{self.BASE_URL}/api/crosswords/{puzzle_id}/clues"
-        ).json()
-        authors = self.session.get(
-            f"{self.BASE_URL}/api/crosswords/{puzzle_id}/authors"
-        ).json()
+        urls = {
+            "meta": puzzle_url,
+            "clues": f"{puzzle_url}/clues",
+            "authors": f"{puzzle_url}/authors",
+        }
 
-        return {"meta": meta, "clues": clues, "authors": authors}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            futures = {
+                key: pool.submit(self._get_json, url) for key, url in urls.items()
+            }
+
+            return {key: future.result() for key, future in futures.items()}
 
     def parse_xword(self, xw_data):
         meta = xw_data["meta"]
@@ -85,7 +130,7 @@ class PrincetonianBaseDownloader(BaseDownloader):
         puzzle.width = width
         puzzle.height = height
 
-        grid = [["." for _ in range(width)] for _ in range(height)]
+        letters = [["." for _ in range(width)] for _ in range(height)]
         circled = set()
         for c in clues:
             x, y, ans = c["x"], c["y"], c["answer"]
@@ -93,25 +138,23 @@ class PrincetonianBaseDownloader(BaseDownloader):
                 for i, letter in enumerate(ans):
                     if letter.islower():
                         circled.add((x + i, y))
-                    grid[y][x + i] = letter.upper()
+                    letters[y][x + i] = letter.upper()
             else:
                 for i, letter in enumerate(ans):
                     if letter.islower():
                         circled.add((x, y + i))
-                    grid[y + i][x] = letter.upper()
-
-        puzzle.solution = "".join("".join(row) for row in grid)
-        puzzle.fill = "".join("-" if c != "." else "." for c in puzzle.solution)
-
-        if circled:
-            markup = bytes(
-                0x80 if (col, row) in circled else 0x00
-                for row in range(height)
-                for col in range(width)
-            )
-            puzzle.extensions[b"GEXT"] = markup
-            puzzle._extensions_order.append(b"GEXT")
-            puzzle.markup()
+                    letters[y + i][x] = letter.upper()
+
+        grid = GridBuilder()
+
+        for row in range(height):
+            for col in range(width):
+                if letters[row][col] == ".":
+                    grid.add_block()
+                else:
+                    grid.add_square(letters[row][col], circled=(col, row) in circled)
+
+        grid.write(puzzle)
 
         sorted_clues = sorted(clues, key=lambda c: (c["y"], c["x"], not c["is_across"]))
         puzzle.clues = [c["clue"] for c in sorted_clues]
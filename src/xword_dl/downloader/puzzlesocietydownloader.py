@@ -1,12 +1,8 @@
 import datetime
-import json
 import urllib.parse
 
-import requests
-
-from bs4 import BeautifulSoup, Tag
-
-from xword_dl.util.utils import XWordDLException
+from xword_dl.util import XWordDLException
+from xword_dl.util.extract import find_script_json
 
 from .compilerdownloader import CrosswordCompilerDownloader
 
@@ -17,6 +13,7 @@ class TheModernDownloader(CrosswordCompilerDownloader):
     # non-trivial.
     outlet = "The Modern"
     outlet_prefix = "The Modern"
+    netloc_hints = ("puzzlesociety.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -40,17 +37,12 @@ class TheModernDownloader(CrosswordCompilerDownloader):
         return "https://www.puzzlesociety.com/crossword-puzzles/modern-crossword"
 
     def find_solver(self, url):
-        res = requests.get(url)
+        res = self.session.get(url)
 
-        soup = BeautifulSoup(res.text, "lxml")
-
-        json_tag = soup.find("script", {"type": "application/json"})
-        if not isinstance(json_tag, Tag):
+        page_props = find_script_json(res.text, type="application/json")
+        if page_props is None:
             raise XWordDLException("Could not find JSON metadata for solver.")
 
-        json_str = json_tag.get_text()
-        page_props = json.loads(json_str)
-
         sets = page_props["props"]["pageProps"]["gameContent"]["gameLevelDataSets"]
 
         self.date = datetime.datetime.strptime(sets[0]["issueDate"], "%Y-%m-%d")
@@ -59,7 +51,7 @@ class TheModernDownloader(CrosswordCompilerDownloader):
         return url
 
     def fetch_data(self, solver_url):
-        res = requests.get(solver_url)
+        res = self.session.get(solver_url)
         xw_data = res.content.decode("utf-8-sig")
 
         return xw_data
@@ -1,20 +1,20 @@
 import re
 import secrets
 
-import dateparser
 import puz
 
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from .basedownloader import BaseDownloader
-from ..util import join_bylines, XWordDLException
+from ..util import GridBuilder, join_bylines, parse_date, XWordDLException
 
 
 class PuzzmoDownloader(BaseDownloader):
     command = "pzm"
     outlet = "Puzzmo"
     outlet_prefix = "Puzzmo"
+    netloc_hints = ("puzzmo.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -106,8 +106,13 @@ class PuzzmoDownloader(BaseDownloader):
             "variables": variables,
         }
 
-        res = self.session.post(
-            "https://www.puzzmo.com/_api/prod/graphql?PlayGameScreenQuery", json=payload
+        # startOrFindGameplay returns the existing gameplay for our gameplay id
+        # if there is one, so it's safe to retry even though it's a POST
+        res = self.session.request(
+            "POST",
+            "https://www.puzzmo.com/_api/prod/graphql?PlayGameScreenQuery",
+            json=payload,
+            idempotent=True,
         )
 
         response = res.json()["data"]["startOrFindGameplay"]
@@ -129,7 +134,7 @@ class PuzzmoDownloader(BaseDownloader):
         puzzle = self.parse_xd_format(xd_data)
 
         # Override xd metadata with more reliable API results
-        self.date = dateparser.parse(xw_data["dailyTitle"]) or dateparser.parse(
+        self.date = parse_date(xw_data["dailyTitle"]) or parse_date(
             xw_data["dailyTitle"].split("-")[0]
         )
 
@@ -151,12 +156,8 @@ class PuzzmoDownloader(BaseDownloader):
         default_sections = ["metadata", "grid", "clues", "notes"]
         observed_height = 0
         observed_width = 0
-        fill = ""
-        solution = ""
-        markup = b""
-        rebus_board = []
-        rebus_index = 0
-        rebus_table = ""
+        grid_lines = []
+        design_lines = []
         clue_list = []
         rebus_entries = {}
 
@@ -206,13 +207,7 @@ class PuzzmoDownloader(BaseDownloader):
 
                 observed_height += 1
 
-                for c in line:
-                    if c.isalnum():
-                        fill += "-"
-                        solution += c.upper()
-                    else:
-                        fill += "."
-                        solution += "."
+                grid_lines.append(line)
 
             elif section == "clues":
                 if clue_parts := re.match(r"([AD])(\d{1,2})\.(.*)", line):
@@ -229,35 +224,26 @@ class PuzzmoDownloader(BaseDownloader):
                 if "style" in line or "{" in line:
                     continue
                 else:
-                    for c in line:
-                        markup += b"\x00" if c in "#." else b"\x80"
-
-        for c in solution:
-            if c in rebus_entries:
-                rebus_board.append(rebus_index + 1)
-                rebus_table += "{:2d}:{};".format(rebus_index, rebus_entries[c])
-                rebus_index += 1
+                    design_lines.append(line)
+
+        circled = [c not in "#." for c in "".join(design_lines)]
+
+        grid = GridBuilder()
+
+        for index, c in enumerate("".join(grid_lines)):
+            if c.isalnum():
+                grid.add_square(
+                    c.upper(),
+                    circled=index < len(circled) and circled[index],
+                    rebus=rebus_entries.get(c.upper()),
+                )
             else:
-                rebus_board.append(0)
+                grid.add_block()
 
         puzzle.height = observed_height
         puzzle.width = observed_width
-        puzzle.solution = solution
-        puzzle.fill = fill
-
-        has_markup = b"\x80" in markup
-        has_rebus = any(rebus_board)
-
-        if has_markup:
-            puzzle.extensions[b"GEXT"] = markup
-            puzzle._extensions_order.append(b"GEXT")
-            puzzle.markup()
-
-        if has_rebus:
-            puzzle.extensions[b"GRBS"] = bytes(rebus_board)
-            puzzle.extensions[b"RTBL"] = rebus_table.encode(puz.ENCODING)
-            puzzle._extensions_order.extend([b"GRBS", b"RTBL"])
-            puzzle.rebus()
+
+        grid.write(puzzle)
 
         clue_list.sort(key=lambda c: (c[1], c[0]))
 
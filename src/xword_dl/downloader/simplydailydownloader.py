@@ -11,6 +11,7 @@ class SimplyDailyDownloader(CrosswordCompilerJSEncodedDownloader):
     outlet_prefix = "Simply Daily"
     url_subdir = "daily-crossword"
     qs_prefix = "dc1"
+    netloc_hints = (website,)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
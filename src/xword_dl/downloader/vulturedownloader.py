@@ -11,6 +11,7 @@ class VultureDownloader(AmuseLabsDownloader):
     command = "vult"
     outlet = "Vulture"
     outlet_prefix = "Vulture"
+    netloc_hints = ("vulture.com",)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -25,7 +26,7 @@ class VultureDownloader(AmuseLabsDownloader):
         )
 
     def find_latest(self) -> str:
-        res = self.session.get(self.archive_url)
+        res = self.cached_get(self.archive_url)
         if not res.ok:
             raise XWordDLException(
                 f"Could not connect to Vulture index at {self.archive_url}"
@@ -4,7 +4,7 @@ from zoneinfo import ZoneInfo
 import puz
 
 from .basedownloader import BaseDownloader
-from ..util import XWordDLException
+from ..util import GridBuilder, XWordDLException
 
 
 class WaPoDownloader(BaseDownloader):
@@ -22,12 +22,16 @@ class WaPoDownloader(BaseDownloader):
 
         return self.find_by_date(most_recent_sunday)
 
-    def find_by_date(self, dt):
+    @classmethod
+    def publishes_on(cls, dt):
         # The Washington Post only publishes a Sunday crossword (by Evan
         # Birnholz) — the API endpoint has no puzzles for other days of the
-        # week, so reject non-Sunday dates up front with a clear error.
-        # isoweekday(): Monday=1 ... Sunday=7.
-        if dt.isoweekday() != 7:
+        # week. isoweekday(): Monday=1 ... Sunday=7.
+        return dt.isoweekday() == 7
+
+    def find_by_date(self, dt):
+        # Reject non-Sunday dates up front with a clear error.
+        if not self.publishes_on(dt):
             raise XWordDLException(
                 f"Invalid date: The Washington Post only publishes a Sunday "
                 f"crossword (no puzzle for {dt.strftime('%Y-%m-%d')}, which is "
@@ -81,22 +85,15 @@ class WaPoDownloader(BaseDownloader):
 
         puzzle.notes = xw_data.get("description", "")
 
-        solution = ""
-        fill = ""
-        markup = b""
+        grid = GridBuilder()
 
         for cell in xw_data["cells"]:
             if ans := cell.get("answer"):
-                solution += ans
-                fill += "-"
-                markup += b"\x80" if cell.get("circle") else b"\x00"
+                grid.add_square(ans, circled=bool(cell.get("circle")))
             else:
-                solution += "."
-                fill += "."
-                markup += b"\x00"
+                grid.add_block()
 
-        puzzle.solution = solution
-        puzzle.fill = fill
+        grid.write(puzzle)
 
         clues = xw_data["words"]
 
@@ -105,11 +102,4 @@ class WaPoDownloader(BaseDownloader):
 
         puzzle.clues = [clue["clue"].strip() for clue in clues]
 
-        has_markup = b"\x80" in markup
-
-        if has_markup:
-            puzzle.extensions[b"GEXT"] = markup
-            puzzle._extensions_order.append(b"GEXT")
-            puzzle.markup()
-
         return puzzle
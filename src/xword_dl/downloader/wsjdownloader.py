@@ -9,7 +9,7 @@ import puz
 from bs4 import BeautifulSoup, Tag
 
 from .basedownloader import BaseDownloader
-from ..util import XWordDLException
+from ..util import GridBuilder, XWordDLException
 
 
 class WSJDownloader(BaseDownloader):
@@ -20,6 +20,7 @@ class WSJDownloader(BaseDownloader):
     #   command = 'wsj'
     outlet = "Wall Street Journal"
     outlet_prefix = "WSJ"
+    netloc_hints = ("wsj.com",)
 
     def __init__(self, **kwargs):
         super().__init__(headers={"User-Agent": "xword-dl"}, **kwargs)
@@ -89,30 +90,22 @@ class WSJDownloader(BaseDownloader):
 
         puzzle.notes = xword_metadata.get("crosswordadditionalcopy") or ""
 
-        solution = ""
-        fill = ""
-        markup = b""
+        grid = GridBuilder()
 
         for row in xw_data:
             for cell in row:
                 if cell.get("Blank"):
-                    fill += "."
-                    solution += "."
-                    markup += b"\x00"
+                    grid.add_block()
                 else:
-                    fill += "-"
-                    solution += cell["Letter"] or "X"
-                    markup += (
-                        b"\x80"
-                        if (
+                    grid.add_square(
+                        cell["Letter"] or "X",
+                        circled=bool(
                             cell.get("style", "")
                             and cell["style"]["shapebg"] == "circle"
-                        )
-                        else b"\x00"
+                        ),
                     )
 
-        puzzle.fill = fill
-        puzzle.solution = solution
+        grid.write(puzzle)
 
         if all(c in [".", "X"] for c in puzzle.solution):
             puzzle.solution_state = 0x0002
@@ -126,11 +119,4 @@ class WSJDownloader(BaseDownloader):
 
         puzzle.clues = clues
 
-        has_markup = b"\x80" in markup
-
-        if has_markup:
-            puzzle.extensions[b"GEXT"] = markup
-            puzzle._extensions_order.append(b"GEXT")
-            puzzle.markup()
-
         return puzzle
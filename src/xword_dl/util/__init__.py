@@ -1 +1,2 @@
 from .utils import *  # noqa: F403
+from .grid import GridBuilder as GridBuilder
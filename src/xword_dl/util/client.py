@@ -0,0 +1,450 @@
+import contextlib
+import email.utils
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .utils import CACHE_PATH, XWordDLException
+
+# Every session shares one adapter, and with it one pool of keep-alive
+# connections per host. Downloads from several outlets served by the same host
+# (such as the AmuseLabs CDNs) reuse connections instead of opening new ones.
+POOL_HOSTS = 32
+POOL_CONNECTIONS_PER_HOST = 16
+
+_adapter = HTTPAdapter(
+    pool_connections=POOL_HOSTS, pool_maxsize=POOL_CONNECTIONS_PER_HOST
+)
+
+HTTP_CACHE_PATH = os.path.join(CACHE_PATH, "http")
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+# Seconds to wait for a connection, and then between bytes of a response,
+# unless a request passes its own timeout
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 30
+
+_deadline_state = threading.local()
+
+
+class DeadlineExceeded(XWordDLException):
+    pass
+
+
+@contextlib.contextmanager
+def deadline(at: float | None):
+    """Requires requests made in this thread to finish by a time.monotonic() value.
+
+    Every request's timeouts are shortened to fit the time remaining, and once
+    it's gone, requests raise DeadlineExceeded instead of being sent. Nested
+    deadlines can shorten the time remaining but not extend it."""
+    previous = getattr(_deadline_state, "at", None)
+
+    if at is None or (previous is not None and previous < at):
+        at = previous
+
+    _deadline_state.at = at
+    try:
+        yield
+    finally:
+        _deadline_state.at = previous
+
+
+def time_remaining() -> float | None:
+    """Returns the seconds left before this thread's deadline, if it has one."""
+    at = getattr(_deadline_state, "at", None)
+    return None if at is None else at - time.monotonic()
+
+
+def _fit_timeout(
+    timeout: float | tuple[float | None, float | None] | None,
+    remaining: float | None,
+) -> float | tuple[float | None, float | None] | None:
+    """Shortens a requests timeout value to fit in the time remaining."""
+    if remaining is None:
+        return timeout
+
+    if isinstance(timeout, tuple):
+        return tuple(  # type: ignore[return-value]
+            remaining if t is None else min(t, remaining) for t in timeout
+        )
+
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+# Responses with these statuses are usually transient, and worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Requests with these methods can be repeated without changing their result.
+# Other requests are retried only when they can't have reached the server, or
+# when passed idempotent=True by a caller who knows they're safe to repeat.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class RetryPolicy:
+    """Describes how often and how long to wait when retrying failed requests.
+
+    Waits grow exponentially from backoff seconds, up to max_wait seconds,
+    with full jitter so that concurrent downloads don't retry in lockstep. A
+    Retry-After header on a 429 or 503 response is honored instead, unless it
+    asks for a longer wait than max_wait."""
+
+    def __init__(self, retries: int = 3, backoff: float = 0.5, max_wait: float = 30):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "RetryPolicy":
+        """Reads the retries, retry-backoff and retry-max-wait settings."""
+        default = cls()
+        return cls(
+            retries=int(settings.get("retries", default.retries)),
+            backoff=float(settings.get("retry_backoff", default.backoff)),
+            max_wait=float(settings.get("retry_max_wait", default.max_wait)),
+        )
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Returns a random wait before retrying after the given attempt."""
+        return random.uniform(0, min(self.max_wait, self.backoff * 2**attempt))
+
+    def retry_delay(self, attempt: int, res: requests.Response) -> float | None:
+        """Returns the wait before retrying a response, or None to give up."""
+        if res.status_code in (429, 503) and "Retry-After" in res.headers:
+            delay = _parse_retry_after(res.headers["Retry-After"])
+            if delay is not None:
+                return delay if delay <= self.max_wait else None
+
+        return self.backoff_delay(attempt)
+
+
+def _parse_retry_after(value: str) -> float | None:
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0)
+
+
+class Session(requests.Session):
+    """A session that uses the shared pools and retries transient failures.
+
+    Requests time out after timeout seconds, a (connect, read) pair as used by
+    requests, unless they pass their own timeout."""
+
+    def __init__(
+        self,
+        retry_policy: RetryPolicy | None = None,
+        timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    ):
+        super().__init__()
+        self.mount("https://", _adapter)
+        self.mount("http://", _adapter)
+
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.timeout = timeout
+
+    def request(  # type: ignore[override]
+        self, method: str, url, *args, idempotent: bool | None = None, **kwargs
+    ) -> requests.Response:
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        policy = self.retry_policy
+        timeout = kwargs.pop("timeout", self.timeout)
+        attempt = 0
+
+        while True:
+            remaining = time_remaining()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Timed out before requesting {url}.")
+
+            try:
+                res = super().request(
+                    method,
+                    url,
+                    *args,
+                    timeout=_fit_timeout(timeout, remaining),
+                    **kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout) as err:
+                remaining = time_remaining()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded(f"Timed out requesting {url}.") from err
+                # a request that never connected can always be sent again
+                never_sent = isinstance(err, requests.ConnectTimeout)
+                if attempt >= policy.retries or not (idempotent or never_sent):
+                    raise
+                delay = policy.backoff_delay(attempt)
+                if remaining is not None and delay >= remaining:
+                    raise
+            else:
+                if res.status_code not in RETRY_STATUSES or attempt >= policy.retries:
+                    return res
+                # a 429 or 503 means the server didn't act on the request
+                if not (idempotent or res.status_code in (429, 503)):
+                    return res
+                delay = policy.retry_delay(attempt, res)
+                remaining = time_remaining()
+                if delay is None or (remaining is not None and delay >= remaining):
+                    return res
+                res.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+
+def new_session(retry_policy: RetryPolicy | None = None) -> Session:
+    """Returns a session that sends its requests through the shared pools."""
+    return Session(retry_policy)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Makes a one-off request, like requests.request, over the shared pools.
+
+    A new session is used for each request so that cookies set by one request
+    aren't sent with another."""
+    return new_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def _cache_entry_path(url: str) -> str:
+    return os.path.join(HTTP_CACHE_PATH, hashlib.sha256(url.encode()).hexdigest())
+
+
+def _read_cache_entry(path: str) -> tuple[dict, bytes] | None:
+    try:
+        with open(path, "rb") as f:
+            meta = json.loads(f.readline())
+            body = f.read()
+    except (OSError, ValueError):
+        return None
+
+    # an entry written by an older version, or damaged, is treated as a miss
+    if not (
+        isinstance(meta, dict)
+        and isinstance(meta.get("headers"), dict)
+        and isinstance(meta.get("max_age"), (int, float))
+        and isinstance(meta.get("stored_at"), (int, float))
+    ):
+        return None
+
+    return meta, body
+
+
+def _write_cache_entry(path: str, meta: dict, body: bytes):
+    try:
+        os.makedirs(HTTP_CACHE_PATH, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(body)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+
+    _evict_cache_entries()
+
+
+def _evict_cache_entries():
+    """Removes the least recently used entries until the cache fits its limit."""
+    try:
+        entries = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(HTTP_CACHE_PATH)
+            if not entry.name.endswith(".tmp")
+        ]
+    except OSError:
+        return
+
+    total_size = sum(size for _, size, _ in entries)
+
+    for _, size, path in sorted(entries):
+        if total_size <= HTTP_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total_size -= size
+
+
+def _freshness_lifetime(headers) -> float:
+    """Returns for how many seconds a response may be reused, per Cache-Control."""
+    directives = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name.lower()] = value.strip('"')
+
+    if "no-cache" in directives:
+        return 0
+
+    try:
+        return max(int(directives.get("max-age", 0)), 0)
+    except ValueError:
+        return 0
+
+
+def _is_shareable(headers) -> bool:
+    """Returns whether a response may be stored in the cache at all."""
+    cache_control = headers.get("Cache-Control", "").lower()
+
+    return (
+        "no-store" not in cache_control
+        and "private" not in cache_control
+        and headers.get("Vary", "").strip() != "*"
+    )
+
+
+def _vary_values(vary: str, request_headers) -> dict:
+    """Returns the request headers named by a Vary header, and their values."""
+    names = [name.strip().lower() for name in vary.split(",") if name.strip()]
+
+    return {name: request_headers.get(name) for name in names}
+
+
+def _matches_vary(meta: dict, request_headers) -> bool:
+    """Returns whether a cached response was stored for matching headers."""
+    vary = meta.get("vary") or {}
+
+    return vary == _vary_values(",".join(vary), request_headers)
+
+
+def _response_from_cache(url: str, meta: dict, body: bytes) -> requests.Response:
+    res = requests.Response()
+    res.status_code = 200
+    res.reason = "OK"
+    res.url = url
+    res.headers = CaseInsensitiveDict(meta["headers"])
+    res.encoding = meta.get("encoding")
+    res._content = body
+
+    return res
+
+
+def _restore_cookies(session: requests.Session, meta: dict):
+    """Restores unexpired cookies set by a cached response.
+
+    Only cookies with an expiry are stored with a response, since session
+    cookies are meant to be dropped when the session that received them ends.
+    """
+    now = time.time()
+    for cookie in meta.get("cookies", []):
+        if not cookie.get("expires") or cookie["expires"] < now:
+            continue
+        if session.cookies.get(cookie["name"], domain=cookie["domain"]) is None:
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"],
+                path=cookie["path"],
+                expires=cookie["expires"],
+            )
+
+
+def cached_get(
+    session: requests.Session, url: str, ttl: float | None = None, **kwargs
+) -> requests.Response:
+    """Makes a GET request with session, reusing a cached response if possible.
+
+    Responses are stored on disk and reused while fresh: for ttl seconds if it
+    is provided, or else for as long as their Cache-Control header allows.
+    Stale responses are revalidated with their ETag or Last-Modified values,
+    so an unchanged page costs a 304 response instead of a full download. This
+    is meant for slowly changing pages, like indexes of recent puzzles.
+
+    Responses marked private, that set session cookies, or that vary with
+    request headers other than this request's, aren't reused.
+    """
+    full_url = requests.Request("GET", url, params=kwargs.pop("params", None))
+    full_url = full_url.prepare().url or url
+
+    request_headers = CaseInsensitiveDict(session.headers)
+    request_headers.update(kwargs.get("headers") or {})
+
+    path = _cache_entry_path(full_url)
+    entry = _read_cache_entry(path)
+
+    if entry and not _matches_vary(entry[0], request_headers):
+        entry = None
+
+    if entry:
+        meta, body = entry
+        lifetime = ttl if ttl is not None else meta["max_age"]
+
+        if time.time() - meta["stored_at"] < lifetime:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            _restore_cookies(session, meta)
+            return _response_from_cache(full_url, meta, body)
+
+        cached_headers = CaseInsensitiveDict(meta["headers"])
+        validators = {}
+        if cached_headers.get("ETag"):
+            validators["If-None-Match"] = cached_headers["ETag"]
+        if cached_headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = cached_headers["Last-Modified"]
+        kwargs["headers"] = dict(kwargs.get("headers") or {}, **validators)
+
+    res = session.get(full_url, **kwargs)
+
+    if entry and res.status_code == 304:
+        meta, body = entry
+        cached_headers = CaseInsensitiveDict(meta["headers"])
+        for header in ("ETag", "Cache-Control", "Last-Modified"):
+            if header in res.headers:
+                cached_headers[header] = res.headers[header]
+        meta["headers"] = dict(cached_headers)
+        meta["max_age"] = _freshness_lifetime(res.headers)
+        meta["stored_at"] = time.time()
+        _write_cache_entry(path, meta, body)
+        _restore_cookies(session, meta)
+        return _response_from_cache(full_url, meta, body)
+
+    # a page that sets a session cookie may only make sense with that session
+    session_cookies = any(not c.expires for c in res.cookies)
+
+    if res.status_code == 200 and _is_shareable(res.headers) and not session_cookies:
+        meta = {
+            "url": full_url,
+            "headers": dict(res.headers),
+            "encoding": res.encoding,
+            "max_age": _freshness_lifetime(res.headers),
+            "stored_at": time.time(),
+            "vary": _vary_values(res.headers.get("Vary", ""), res.request.headers),
+            "cookies": [
+                {
+                    "name": c.name,
+                    "value": c.value,
+                    "domain": c.domain,
+                    "path": c.path,
+                    "expires": c.expires,
+                }
+                for c in res.cookies
+            ],
+        }
+        _write_cache_entry(path, meta, res.content)
+
+    return res
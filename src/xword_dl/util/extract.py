@@ -0,0 +1,101 @@
+import html
+import json
+import re
+
+from .utils import XWordDLException
+
+# An HTML start tag, with its attributes. Quoted attribute values may contain
+# '>', so they're matched whole rather than stopping at the first one.
+_START_TAG_TEMPLATE = (
+    r"<{name}(?=[\s/>])"
+    r"((?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?|\s*/)*)"
+    r"\s*>"
+)
+_ATTRIBUTE_RE = re.compile(
+    r"([^\s\"'>/=]+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'>]+)))?"
+)
+
+_SCRIPT_END_RE = re.compile(r"</script", re.IGNORECASE)
+
+_start_tag_res = {}
+
+
+def _start_tag_re(name: str) -> re.Pattern:
+    if name not in _start_tag_res:
+        _start_tag_res[name] = re.compile(
+            _START_TAG_TEMPLATE.format(name=re.escape(name)), re.IGNORECASE
+        )
+    return _start_tag_res[name]
+
+
+def _parse_attributes(attr_source: str) -> dict[str, str]:
+    return {
+        m.group(1).lower(): html.unescape(
+            next((v for v in m.group(2, 3, 4) if v is not None), "")
+        )
+        for m in _ATTRIBUTE_RE.finditer(attr_source)
+    }
+
+
+def _scan_start_tags(source: str, name: str, attrs: dict):
+    """Yields the attributes and end position of each matching start tag."""
+    for m in _start_tag_re(name).finditer(source):
+        tag_attrs = _parse_attributes(m.group(1))
+        if all(tag_attrs.get(k) == v for k, v in attrs.items()):
+            yield tag_attrs, m.end()
+
+
+def _soup_find(source: str, name: str, attrs: dict):
+    # bs4 is slow to import, and only needed when scanning finds nothing
+    from bs4 import BeautifulSoup, Tag
+    from bs4.filter import SoupStrainer
+
+    soup = BeautifulSoup(source, "lxml", parse_only=SoupStrainer(name, attrs=attrs))
+    tag = soup.find(name, attrs=attrs)
+    return tag if isinstance(tag, Tag) else None
+
+
+def find_tag_attrs(
+    source: str, tag_name: str, /, **attrs: str
+) -> dict[str, str] | None:
+    """Returns the attributes of the first tag_name tag in source matching attrs.
+
+    The page is scanned for start tags rather than parsed, and is only parsed
+    with BeautifulSoup if the scan finds nothing."""
+    for tag_attrs, _ in _scan_start_tags(source, tag_name, attrs):
+        return tag_attrs
+
+    tag = _soup_find(source, tag_name, attrs)
+    if tag is None:
+        return None
+
+    return {k: v if isinstance(v, str) else " ".join(v) for k, v in tag.attrs.items()}
+
+
+def find_script_text(source: str, /, **attrs: str) -> str | None:
+    """Returns the contents of the first script tag in source matching attrs.
+
+    Script contents are raw text that ends at the first closing script tag, so
+    they can be sliced straight out of the page without parsing it."""
+    for _, start in _scan_start_tags(source, "script", attrs):
+        end = _SCRIPT_END_RE.search(source, start)
+        if end:
+            return source[start : end.start()]
+
+    tag = _soup_find(source, "script", attrs)
+    return tag.get_text() if tag is not None else None
+
+
+def find_script_json(source: str, /, **attrs: str):
+    """Returns the decoded JSON contents of the first script tag matching attrs.
+
+    Returns None if there's no such tag, and raises XWordDLException if its
+    contents aren't valid JSON."""
+    text = find_script_text(source, **attrs)
+    if text is None:
+        return None
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        raise XWordDLException("Could not decode JSON data embedded in page.")
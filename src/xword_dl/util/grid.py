@@ -0,0 +1,56 @@
+import puz
+
+
+class GridBuilder:
+    """Collects a puzzle's squares in reading order and writes them to a Puzzle.
+
+    Squares are kept in lists and a bytearray rather than appended to strings,
+    so building a grid takes time proportional to its size. Circled squares
+    and rebus answers are written to the GEXT, GRBS and RTBL extensions of the
+    puzzle, if there are any.
+    """
+
+    def __init__(self):
+        self.solution = []
+        self.fill = []
+        self.markup = bytearray()
+        self.rebus_board = bytearray()
+        self.rebus_table = []
+
+    def add_block(self):
+        self.solution.append(".")
+        self.fill.append(".")
+        self.markup.append(0x00)
+        self.rebus_board.append(0)
+
+    def add_square(self, solution: str, circled=False, rebus: str | None = None):
+        """Adds a white square.
+
+        If the square has a rebus answer, solution should be the single letter
+        to show in its place to solvers that don't support rebuses."""
+        self.solution.append(solution)
+        self.fill.append("-")
+        self.markup.append(0x80 if circled else 0x00)
+
+        if rebus:
+            rebus_index = len(self.rebus_table)
+            self.rebus_board.append(rebus_index + 1)
+            self.rebus_table.append("{:2d}:{};".format(rebus_index, rebus))
+        else:
+            self.rebus_board.append(0)
+
+    def write(self, puzzle: puz.Puzzle):
+        """Sets the solution, fill and grid extensions of puzzle."""
+        puzzle.solution = "".join(self.solution)
+        puzzle.fill = "".join(self.fill)
+
+        if 0x80 in self.markup:
+            puzzle.extensions[b"GEXT"] = bytes(self.markup)
+            puzzle._extensions_order.append(b"GEXT")
+            puzzle.markup()
+
+        if self.rebus_table:
+            puzzle.extensions[b"GRBS"] = bytes(self.rebus_board)
+            puzzle.extensions[b"RTBL"] = "".join(self.rebus_table).encode(puz.ENCODING)
+            puzzle._extensions_order.extend([b"GRBS", b"RTBL"])
+            puzzle.rebus()
@@ -1,14 +1,23 @@
+import copy
+import datetime
+import functools
+import html.entities
+import json
 import os
+import re
+import string
 import sys
+import threading
 
-import dateparser
-import emoji
 import unidecode as _unidecode
 import yaml
 from puz import Puzzle
 from unidecode import unidecode
 
-from html2text import html2text
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
 
 
 # The unidecode module converts Unicode strings to plain ASCII. The puz format,
@@ -20,16 +29,18 @@ _unidecode.Cache[0] = [chr(c) if c > 127 else "" for c in range(256)]
 CONFIG_PATH = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
 CONFIG_PATH = os.path.join(CONFIG_PATH, "xword-dl/xword-dl.yaml")
 
-if not os.path.exists(CONFIG_PATH):
-    os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
-    open(CONFIG_PATH, "a").close()
+CACHE_PATH = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+CACHE_PATH = os.path.join(CACHE_PATH, "xword-dl")
+
+SAVED_INDEX_PATH = os.path.join(CACHE_PATH, "saved.json")
+_saved_index_lock = threading.Lock()
 
 
 class XWordDLException(Exception):
     pass
 
 
-def save_puzzle(puzzle: Puzzle, filename: str):
+def save_puzzle(puzzle: Puzzle, filename: str) -> bool:
     if not os.path.exists(filename):
         puzzle.save(filename)
         msg = (
@@ -38,11 +49,51 @@ def save_puzzle(puzzle: Puzzle, filename: str):
             else filename
         )
         print(msg)
+        return True
     else:
         print(
             "Not saving: a file named {} already exists.".format(filename),
             file=sys.stderr,
         )
+        return False
+
+
+def _read_saved_index() -> dict:
+    try:
+        with open(SAVED_INDEX_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def find_saved_puzzles(command: str, date) -> list[str]:
+    """Returns paths at which a puzzle from an outlet and date has been saved."""
+    with _saved_index_lock:
+        index = _read_saved_index()
+
+    return index.get(command, {}).get(date.strftime("%Y-%m-%d"), [])
+
+
+def record_saved_puzzle(command: str, date, filename: str):
+    """Adds a saved puzzle file to the index of saved puzzles."""
+    path = os.path.abspath(filename)
+    date_key = date.strftime("%Y-%m-%d")
+
+    with _saved_index_lock:
+        index = _read_saved_index()
+        paths = index.setdefault(command, {}).setdefault(date_key, [])
+        if path in paths:
+            return
+        paths.append(path)
+
+        try:
+            os.makedirs(CACHE_PATH, exist_ok=True)
+            tmp_path = f"{SAVED_INDEX_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, SAVED_INDEX_PATH)
+        except OSError:
+            pass
 
 
 def join_bylines(byline_list: list[str], and_word="&"):
@@ -62,12 +113,267 @@ def remove_invalid_chars_from_filename(filename: str):
     return filename
 
 
+def iterparse_xml(data: str | bytes, chunk_size=64 * 1024):
+    """Yields each element of an XML document as soon as it has been parsed.
+
+    Elements are yielded after all of their children, and callers can clear
+    them once they've been used so that the whole tree is never kept. Raises
+    XWordDLException if the document is malformed."""
+    import lxml.etree  # slow to import, and only needed for XML puzzles
+
+    parser = lxml.etree.XMLPullParser(events=("end",))
+
+    try:
+        for start in range(0, len(data), chunk_size):
+            parser.feed(data[start : start + chunk_size])
+            for _, element in parser.read_events():
+                yield element
+
+        parser.close()
+        for _, element in parser.read_events():
+            yield element
+    except lxml.etree.XMLSyntaxError:
+        raise XWordDLException("Puzzle data malformed, cannot parse.")
+
+
+def xml_localname(element) -> str:
+    """Returns an element's tag name without its namespace."""
+    return element.tag.rpartition("}")[2]
+
+
+# Text that cleanup would return unchanged apart from stripping it: printable
+# ASCII with no tags, entities or backslashes, no runs of whitespace for
+# html2text to collapse, and no leading list marker for it to escape.
+_PLAIN_TEXT_RE = re.compile(r"(?! *(?:\d+\. |[-+][ -]))(?:[!-%'-;=-\[\]-~]| (?! ))*")
+
+CLEANUP_CACHE_SIZE = 4096
+
+# Clue markup is split into tags, character references and the text between
+# them. Anything else that starts with '<' or '&' is left in the text, where
+# it's taken as a sign of markup the converter doesn't know.
+_CLUE_MARKUP_TOKEN_RE = re.compile(
+    r"<(/?)([a-zA-Z][a-zA-Z0-9]*)"
+    r"((?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?)*)\s*(/?)>"
+    r"|&(?:#([0-9]+)|#[xX]([0-9a-fA-F]+)|([a-zA-Z][a-zA-Z0-9]*));"
+)
+
+# Text html2text would escape: backslashes and leading list markers
+_MARKDOWN_ESCAPE_RE = re.compile(r"\\|^\s*(?:\d+\.\s|\+\s|-[\s-])", re.MULTILINE)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# html2text writes these entities as plain ASCII instead of the characters
+# they stand for
+_ASCII_ENTITIES = {
+    "rsquo": "'",
+    "lsquo": "'",
+    "rdquo": '"',
+    "ldquo": '"',
+    "copy": "(C)",
+    "mdash": "--",
+    "rarr": "->",
+    "larr": "<-",
+    "middot": "*",
+    "ndash": "-",
+    "oelig": "oe",
+    "aelig": "ae",
+    "agrave": "a",
+    "aacute": "a",
+    "acirc": "a",
+    "atilde": "a",
+    "auml": "a",
+    "aring": "a",
+    "egrave": "e",
+    "eacute": "e",
+    "ecirc": "e",
+    "euml": "e",
+    "igrave": "i",
+    "iacute": "i",
+    "icirc": "i",
+    "iuml": "i",
+    "ograve": "o",
+    "oacute": "o",
+    "ocirc": "o",
+    "otilde": "o",
+    "ouml": "o",
+    "ugrave": "u",
+    "uacute": "u",
+    "ucirc": "u",
+    "uuml": "u",
+    "lrm": "",
+    "rlm": "",
+}
+_ASCII_CODEPOINTS = {
+    html.entities.name2codepoint[name]: text for name, text in _ASCII_ENTITIES.items()
+}
+
+# Non-breaking spaces are kept out of whitespace collapsing until the end
+_NBSP_PLACEHOLDER = "&nbsp_place_holder;"
+
+
+class _ClueMarkupConverter:
+    """Converts the markup found in clues to text, the way html2text does.
+
+    Only emphasis, superscripts and subscripts, line breaks, spans and
+    character references are understood, and convert returns None for any
+    other markup. Otherwise, its result is the same as html2text's.
+    """
+
+    def __init__(self):
+        self.out = []
+        self.start = True
+        self.space = False
+        self.stressed = False
+        self.preceding_stressed = False
+        self.preceding_data = ""
+
+    def output(self, data: str, puredata=False):
+        if puredata:
+            data = _WHITESPACE_RE.sub(" ", data)
+            if data and data[0] == " ":
+                self.space = True
+                data = data[1:]
+        if not data:
+            return
+
+        if self.start:
+            self.space = False
+            self.start = False
+
+        if self.space:
+            if not (self.out and self.out[-1].endswith("\n")):
+                self.out.append(" ")
+            self.space = False
+
+        self.out.append(data)
+
+    def handle_data(self, data: str):
+        if not data:
+            return
+
+        if self.stressed:
+            data = data.strip()
+            self.stressed = False
+            self.preceding_stressed = True
+        elif self.preceding_stressed:
+            if re.match(r"[^][(){}\s.!?]", data[0]):
+                data = " " + data
+            self.preceding_stressed = False
+
+        self.preceding_data = data
+        self.output(data, puredata=True)
+
+    def handle_tag(self, tag: str, start: bool) -> bool:
+        if tag in ("i", "em"):
+            if (
+                start
+                and self.preceding_data
+                and self.preceding_data[-1] not in string.whitespace
+                and self.preceding_data[-1] not in string.punctuation
+            ):
+                self.output(" _")
+                self.preceding_data += " "
+            else:
+                self.output("_")
+            self.stressed = self.stressed or start
+        elif tag in ("b", "strong"):
+            if start and self.preceding_data and self.preceding_data[-1] == "*":
+                self.output(" **")
+                self.preceding_data += " "
+            else:
+                self.output("**")
+            self.stressed = self.stressed or start
+        elif tag == "br" and start:
+            self.output("  \n")
+        elif tag not in ("sup", "sub", "span"):
+            return False
+
+        return True
+
+    def entity_text(self, name: str | None, codepoint: int | None) -> str | None:
+        if name is not None:
+            if name == "nbsp":
+                return _NBSP_PLACEHOLDER
+            if name in _ASCII_ENTITIES:
+                return _ASCII_ENTITIES[name]
+            return html.entities.html5.get(name + ";")
+
+        assert codepoint is not None
+        if codepoint in _ASCII_CODEPOINTS:
+            return _ASCII_CODEPOINTS[codepoint]
+        if (
+            0x20 <= codepoint < 0x7F
+            or 0xA0 <= codepoint < 0xD800
+            or 0xE000 <= codepoint < 0x110000
+        ):
+            return chr(codepoint)
+        return None
+
+    def handle_text(self, text: str) -> bool:
+        if "<" in text or "&" in text or _MARKDOWN_ESCAPE_RE.search(text):
+            return False
+
+        self.handle_data(text)
+        return True
+
+    def convert(self, field: str) -> str | None:
+        pos = 0
+        for m in _CLUE_MARKUP_TOKEN_RE.finditer(field):
+            if not self.handle_text(field[pos : m.start()]):
+                return None
+            pos = m.end()
+
+            closing, tag, _, self_closing, dec, hexa, name = m.groups()
+            if tag:
+                tag = tag.lower()
+                if self_closing and (closing or tag != "br"):
+                    return None
+                if not self.handle_tag(tag, not closing):
+                    return None
+            else:
+                codepoint = int(dec) if dec else int(hexa, 16) if hexa else None
+                text = self.entity_text(name, codepoint)
+                if text is None:
+                    return None
+                self.handle_data(text)
+
+        if not self.handle_text(field[pos:]):
+            return None
+
+        self.out.append("\n")
+        return "".join(self.out).replace(_NBSP_PLACEHOLDER, " ")
+
+
+def clue_markup_to_text(field: str) -> str:
+    """Converts HTML in a clue or other puzzle field to Markdown-style text.
+
+    The tags and entities used in clues are converted without html2text, which
+    is slow to import and to run, and is only used for other markup."""
+    text = _ClueMarkupConverter().convert(field)
+    if text is None:
+        from html2text import html2text
+
+        text = html2text(field, bodywidth=0)
+
+    return text
+
+
+@functools.lru_cache(maxsize=CLEANUP_CACHE_SIZE)
+def _cleanup(field: str, preserve_html: bool) -> str:
+    # emoji is slow to import, and most fields don't need it
+    import emoji
+
+    if not preserve_html:
+        field = clue_markup_to_text(field)
+
+    return unidecode(emoji.demojize(field)).strip()
+
+
 def cleanup(field: str, preserve_html=False):
-    if preserve_html:
-        field = unidecode(emoji.demojize(field)).strip()
-    else:
-        field = unidecode(emoji.demojize(html2text(field, bodywidth=0))).strip()
-    return field
+    if field.isascii() and (preserve_html or _PLAIN_TEXT_RE.fullmatch(field)):
+        return field.strip()
+
+    return _cleanup(field, bool(preserve_html))
 
 
 def sanitize_for_puzfile(puzzle: Puzzle, preserve_html=False) -> Puzzle:
@@ -82,8 +388,137 @@ def sanitize_for_puzfile(puzzle: Puzzle, preserve_html=False) -> Puzzle:
     return puzzle
 
 
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("january", "jan"),
+            ("february", "feb"),
+            ("march", "mar"),
+            ("april", "apr"),
+            ("may",),
+            ("june", "jun"),
+            ("july", "jul"),
+            ("august", "aug"),
+            ("september", "sept", "sep"),
+            ("october", "oct"),
+            ("november", "nov"),
+            ("december", "dec"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+_WEEKDAYS = (
+    "monday mon tuesday tues tue wednesday wed thursday thurs thur thu friday fri "
+    "saturday sat sunday sun"
+).split()
+
+_MONTH_RE = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_WEEKDAY_RE = "|".join(sorted(_WEEKDAYS, key=len, reverse=True))
+
+# The date formats used by outlets and most often entered on the command line:
+# ISO, m/d/y, (weekday) month day year and (weekday) day month year. Dates are
+# matched in lowercase, with commas removed and runs of spaces collapsed.
+_DATE_RES = [
+    r"(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})",
+    r"(?P<m>\d{1,2})/(?P<d>\d{1,2})/(?P<y>\d{4}|\d{2})",
+    rf"(?:(?:{_WEEKDAY_RE})\.? )?(?P<mn>{_MONTH_RE})\.? (?P<d>\d{{1,2}})"
+    r"(?:st|nd|rd|th)? (?P<y>\d{4})",
+    rf"(?:(?:{_WEEKDAY_RE})\.? )?(?P<d>\d{{1,2}})(?:st|nd|rd|th)? (?P<mn>{_MONTH_RE})"
+    r"\.? (?P<y>\d{4})",
+]
+_DATE_PATTERNS = [re.compile(r) for r in _DATE_RES] + [
+    re.compile(r"(?P<y>\d{4})(?P<m>\d{2})(?P<d>\d{2})"),
+    re.compile(r"(?P<y>\d{2})(?P<m>\d{2})(?P<d>\d{2})"),
+]
+_DATE_SEARCH_PATTERNS = [re.compile(rf"\b{r}\b") for r in _DATE_RES]
+
+_RELATIVE_DAYS = {"today": 0, "yesterday": 1}
+
+# dateparser is slow to import and to run, so it's only used for dates that
+# aren't in a known format, and only tries English
+DATEPARSER_LANGUAGES = ["en"]
+
+
+def _normalize_date_string(date_string: str) -> str:
+    return " ".join(date_string.replace(",", " ").split()).lower()
+
+
+def _date_from_match(match: re.Match) -> datetime.datetime | None:
+    groups = match.groupdict()
+
+    year = int(groups["y"])
+    two_digit_year = len(groups["y"]) == 2
+    month = _MONTHS[groups["mn"]] if "mn" in groups else int(groups["m"])
+
+    try:
+        date = datetime.datetime(
+            year + 2000 if two_digit_year else year, month, int(groups["d"])
+        )
+        # Like dateparser, two-digit years are taken to be in the past
+        if two_digit_year and date > datetime.datetime.now():
+            date = date.replace(year=year + 1900)
+    except ValueError:
+        return None
+
+    return date
+
+
+def _parse_known_date(date_string: str) -> datetime.datetime | None:
+    normalized = _normalize_date_string(date_string)
+
+    if normalized in _RELATIVE_DAYS:
+        return datetime.datetime.now() - datetime.timedelta(
+            days=_RELATIVE_DAYS[normalized]
+        )
+
+    for pattern in _DATE_PATTERNS:
+        match = pattern.fullmatch(normalized)
+        if match:
+            return _date_from_match(match)
+
+    return None
+
+
 def parse_date(entered_date: str):
-    return dateparser.parse(entered_date, settings={"PREFER_DATES_FROM": "past"})
+    """Returns the date described by a string, or None if there isn't one.
+
+    Dates in common formats are parsed directly, and anything else, such as
+    relative dates like "last monday", is left to dateparser."""
+    guessed_dt = _parse_known_date(entered_date)
+    if guessed_dt:
+        return guessed_dt
+
+    import dateparser
+
+    return dateparser.parse(
+        entered_date,
+        languages=DATEPARSER_LANGUAGES,
+        settings={"PREFER_DATES_FROM": "past"},
+    )
+
+
+def search_date(text: str):
+    """Returns the last date found in a string of text, or None."""
+    normalized = _normalize_date_string(text)
+    found_dates = sorted(
+        (match.start(), date)
+        for pattern in _DATE_SEARCH_PATTERNS
+        for match in pattern.finditer(normalized)
+        if (date := _date_from_match(match))
+    )
+    if found_dates:
+        return found_dates[-1][1]
+
+    import dateparser.search
+
+    possible_dates = dateparser.search.search_dates(
+        text, languages=DATEPARSER_LANGUAGES
+    )
+
+    return possible_dates[-1][1] if possible_dates else None
 
 
 def parse_date_or_exit(entered_date: str):
@@ -97,9 +532,65 @@ def parse_date_or_exit(entered_date: str):
     return guessed_dt
 
 
+class ConfigFile:
+    """The parsed contents of the YAML config file, shared within a process.
+
+    The file is parsed once and only read again if its modification time
+    changes, so settings lookups don't each cost a YAML parse. The file is
+    created, empty, the first time it's needed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._config = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _stat(self) -> int:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            open(self.path, "a").close()
+            return os.stat(self.path).st_mtime_ns
+
+    def load(self) -> dict:
+        mtime = self._stat()
+
+        with self._lock:
+            if self._config is None or mtime != self._mtime:
+                with open(self.path, "r") as f:
+                    self._config = yaml.load(f, Loader=_YAMLLoader) or {}
+                self._mtime = mtime
+
+            return self._config
+
+    def invalidate(self):
+        with self._lock:
+            self._config = None
+            self._mtime = None
+
+
+_config_file = ConfigFile(CONFIG_PATH)
+
+
+def date_range(start: datetime.datetime, end: datetime.datetime):
+    """Returns a list of every date from start to end, inclusive.
+
+    Times of day are dropped, so that a relative date like "today" and an
+    explicit date for the same day are treated alike."""
+    start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = end.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if end < start:
+        raise XWordDLException("The end of a date range can't be before its start.")
+
+    return [start + datetime.timedelta(days=n) for n in range((end - start).days + 1)]
+
+
 def update_config_file(heading: str, new_values_dict: dict):
-    with open(CONFIG_PATH, "r") as f:
-        config = yaml.safe_load(f) or {}
+    _config_file.invalidate()
+    config = copy.deepcopy(_config_file.load())
 
     if heading not in config:
         config[heading] = {}
@@ -109,14 +600,18 @@ def update_config_file(heading: str, new_values_dict: dict):
     with open(CONFIG_PATH, "w") as f:
         yaml.dump(config, f)
 
+    _config_file.invalidate()
+
 
 def read_config_values(heading: str):
-    with open(CONFIG_PATH, "r") as f:
-        config = yaml.safe_load(f) or {}
+    config = _config_file.load()
 
     # config file keys and command line flags use '-', python uses '_', so we
-    # replace '-' with '_' for the settings object
+    # replace '-' with '_' for the settings object. Values are copied so that
+    # downloaders can modify their settings without touching the shared config
     raw_subsettings = config.get(heading) or {}
-    subsettings = {k.replace("-", "_"): raw_subsettings[k] for k in raw_subsettings}
+    subsettings = {
+        k.replace("-", "_"): copy.deepcopy(raw_subsettings[k]) for k in raw_subsettings
+    }
 
     return subsettings
@@ -1,32 +1,65 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
+import datetime
+import itertools
 import json
 import sys
 import textwrap
+import threading
 import urllib.parse
 
-import requests
-
 from puz import Puzzle
 
-from .downloader import get_plugins
-from .downloader.basedownloader import BaseDownloader as __bd
-from .util import XWordDLException, parse_date_or_exit, save_puzzle
+from .downloader import get_manifest, load_plugin
+from .downloader.basedownloader import BaseDownloader
+from .util import (
+    XWordDLException,
+    client,
+    date_range,
+    parse_date_or_exit,
+    record_saved_puzzle,
+    save_puzzle,
+)
 
 try:
     from ._version import __version__ as __version__  # type: ignore
 except ModuleNotFoundError:
     __version__ = "0.0.0-dev"
 
-plugins = get_plugins()
+ALL_KEYWORD = "all"
+DEFAULT_BATCH_WORKERS = 8
 
 
 def by_keyword(keyword: str, **kwargs) -> tuple[Puzzle, str]:
-    selected_downloader = next(
-        (d for d in get_supported_outlets(command_only=True) if d.command == keyword),
-        None,
-    )
+    dl, puzzle_url = find_by_keyword(keyword, **kwargs)
+
+    puzzle = dl.download(puzzle_url)
+    filename = dl.pick_filename(puzzle)
+
+    return puzzle, filename
+
+
+def by_url(url: str, **kwargs) -> tuple[Puzzle, str]:
+    dl, puzzle_url = find_by_url(url, **kwargs)
+
+    puzzle = dl.download(puzzle_url)
+    filename = dl.pick_filename(puzzle)
+
+    return puzzle, filename
+
+
+def find_by_keyword(keyword: str, **kwargs) -> tuple[BaseDownloader, str]:
+    """Select a downloader by keyword and find the URL of the requested puzzle."""
+    dl = _select_by_keyword(keyword, **kwargs)
+
+    return dl, _find_puzzle_url(dl, dl.date if kwargs.get("date") else None)
+
+
+def _select_by_keyword(keyword: str, **kwargs) -> BaseDownloader:
+    """Select a downloader by keyword, with the requested date parsed."""
+    selected_downloader = get_plugin_by_command(keyword)
 
     if selected_downloader:
         dl = selected_downloader(**kwargs)
@@ -35,32 +68,39 @@ def by_keyword(keyword: str, **kwargs) -> tuple[Puzzle, str]:
 
     date = kwargs.get("date")
 
-    if not date:
-        puzzle_url = dl.find_latest()
-    else:
-        parsed_date = parse_date_or_exit(date)
-        dl.date = parsed_date
+    if date:
+        dl.date = (
+            date if isinstance(date, datetime.datetime) else parse_date_or_exit(date)
+        )
+
+    return dl
+
+
+def _find_puzzle_url(dl: BaseDownloader, date: datetime.datetime | None) -> str:
+    """Find the URL of the puzzle for a date, or of the latest puzzle."""
+    with dl.deadline():
+        if not date:
+            return dl.find_latest()
+
         try:
-            puzzle_url = dl.find_by_date(parsed_date)
+            return dl.find_by_date(date)
         except NotImplementedError:
             raise XWordDLException(
                 "Selection by date not available for {}.".format(dl.outlet)
             )
 
-    puzzle = dl.download(puzzle_url)
-    filename = dl.pick_filename(puzzle)
-
-    return puzzle, filename
 
+def find_by_url(url: str, **kwargs) -> tuple[BaseDownloader, str]:
+    """Select a downloader that can handle a URL and find the puzzle's URL."""
+    url_components = urllib.parse.urlparse(url)
 
-def by_url(url: str, **kwargs) -> tuple[Puzzle, str]:
-    supported_downloaders = get_supported_outlets(matches_url=True)
+    supported_downloaders = get_supported_outlets(
+        matches_url=True, netloc=url_components.netloc
+    )
 
     dl = None
 
     for d in supported_downloaders:
-        url_components = urllib.parse.urlparse(url)
-
         if d.matches_url(url_components):
             dl = d(url=url, **kwargs)
             puzzle_url = url
@@ -68,20 +108,16 @@ def by_url(url: str, **kwargs) -> tuple[Puzzle, str]:
     else:
         dl, puzzle_url = parse_for_embedded_puzzle(url, **kwargs)
 
-    if dl and puzzle_url:
-        puzzle = dl.download(puzzle_url)
-    else:
+    if not (dl and puzzle_url):
         raise XWordDLException("Unable to find a puzzle at {}.".format(url))
 
-    filename = dl.pick_filename(puzzle)
-
-    return puzzle, filename
+    return dl, puzzle_url
 
 
 def parse_for_embedded_puzzle(url: str, **kwargs):
     supported_downloaders = get_supported_outlets(matches_embed_pattern=True)
 
-    res = requests.get(url, headers={"User-Agent": "xword-dl"})
+    res = client.get(url, headers={"User-Agent": "xword-dl"})
     page_source = res.text
 
     for dlr in supported_downloaders:
@@ -94,39 +130,221 @@ def parse_for_embedded_puzzle(url: str, **kwargs):
     return None, None
 
 
+def by_source(source: str, **kwargs) -> tuple[Puzzle, str]:
+    if source.startswith("http"):
+        return by_url(source, **kwargs)
+    else:
+        return by_keyword(source, **kwargs)
+
+
+def download_and_save(source: str, **kwargs) -> bool:
+    """Download and save a puzzle, unless it's been saved before.
+
+    When the date of the puzzle is known before downloading it, an existing
+    file for the puzzle is looked for first, and if one is found, no further
+    work is done. Returns whether a new file was saved."""
+    if source.startswith("http"):
+        dl, puzzle_url = find_by_url(source, **kwargs)
+    else:
+        dl = _select_by_keyword(source, **kwargs)
+
+        # with a date given, a saved puzzle is found before looking it up, so
+        # that no requests are made for it at all
+        if kwargs.get("date") and _report_saved_file(dl):
+            return False
+
+        puzzle_url = _find_puzzle_url(dl, dl.date if kwargs.get("date") else None)
+
+    if _report_saved_file(dl):
+        return False
+
+    expected_date = dl.date
+
+    puzzle = dl.download(puzzle_url)
+    filename = dl.pick_filename(puzzle)
+
+    if not filename.endswith(".puz"):
+        filename = filename + ".puz"
+
+    saved = save_puzzle(puzzle, filename)
+
+    if dl.command:
+        for date in {expected_date, dl.date}:
+            if date:
+                record_saved_puzzle(dl.command, date, filename)
+
+    return saved
+
+
+def _report_saved_file(dl: BaseDownloader) -> bool:
+    """Reports whether, and where, a downloader's puzzle was already saved."""
+    saved_filename = dl.find_saved_file()
+
+    if saved_filename:
+        print(
+            "Not downloading: puzzle already saved as {}.".format(saved_filename),
+            file=sys.stderr,
+        )
+
+    return bool(saved_filename)
+
+
+def _download_job(source: str, semaphore=None, **kwargs) -> bool:
+    if semaphore is None:
+        return download_and_save(source, **kwargs)
+
+    with semaphore:
+        return download_and_save(source, **kwargs)
+
+
+def _plan_date_range_jobs(source: str, dates: list[datetime.datetime], **kwargs):
+    """Returns a list of (label, source, kwargs) jobs for one outlet by date.
+
+    Dates for which the outlet has no puzzle are skipped, as far as the
+    outlet can tell in advance. The jobs share one session, so that
+    connections and cookies are reused from one date to the next, and a
+    semaphore capping how many of them run at once.
+    """
+    plugin = get_plugin_by_command(source)
+
+    if plugin is None:
+        raise XWordDLException("Keyword {} not recognized.".format(source))
+
+    session = client.new_session()
+    planner = plugin(session=session, **kwargs)
+
+    limit = planner.settings.get(
+        "max_concurrent_downloads", plugin.max_concurrent_downloads
+    )
+
+    with planner.deadline():
+        dates = planner.available_dates(dates)
+
+    shared = dict(
+        kwargs,
+        session=session,
+        semaphore=threading.BoundedSemaphore(max(int(limit), 1)),
+    )
+
+    return [(f"{source} {dt:%Y-%m-%d}", source, dict(shared, date=dt)) for dt in dates]
+
+
+def download_batch(
+    sources: list[str],
+    dates: list[datetime.datetime] | None = None,
+    max_workers=DEFAULT_BATCH_WORKERS,
+    **kwargs,
+) -> dict[str, Exception | None]:
+    """Download and save puzzles from several sources concurrently.
+
+    If a list of dates is provided, each source is downloaded for each date.
+    Returns a dict mapping a label for each job to the exception that stopped
+    it, or None if it succeeded. A failure in one job doesn't affect any of
+    the others."""
+    get_manifest()  # load once up front rather than racing in every worker
+
+    results = {}
+    jobs_by_source = []
+
+    for source in sources:
+        if dates is None:
+            jobs_by_source.append([(source, source, kwargs)])
+            continue
+
+        # planning may make requests, so any failure only skips this source
+        try:
+            jobs_by_source.append(_plan_date_range_jobs(source, dates, **kwargs))
+        except Exception as e:
+            print(f"{source}: {e}", file=sys.stderr)
+            results[source] = e
+
+    # interleave outlets so that workers aren't all left waiting on one
+    # outlet's concurrency limit
+    jobs = [
+        job
+        for round_of_jobs in itertools.zip_longest(*jobs_by_source)
+        for job in round_of_jobs
+        if job is not None
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_download_job, source, **job_kwargs): label
+            for label, source, job_kwargs in jobs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            label = futures[future]
+            try:
+                future.result()
+                results[label] = None
+            except Exception as e:
+                print(f"{label}: {e}", file=sys.stderr)
+                results[label] = e
+
+    return results
+
+
+def expand_sources(sources: list[str]) -> list[str]:
+    """Expand the 'all' keyword and drop duplicate sources, keeping order."""
+    expanded = []
+    for source in sources:
+        if source == ALL_KEYWORD:
+            expanded.extend(e["command"] for e in get_manifest() if e["command"])
+        else:
+            expanded.append(source)
+
+    return list(dict.fromkeys(expanded))
+
+
+def read_batch_file(path: str) -> list[str]:
+    """Read sources from a file, one per line, ignoring blanks and # comments."""
+    try:
+        with open(path, "r") as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+    except OSError as e:
+        raise XWordDLException(f"Unable to read batch file {path}: {e.strerror}")
+
+    return [line for line in lines if line]
+
+
+def get_plugin_by_command(command: str):
+    entry = next((e for e in get_manifest() if e["command"] == command), None)
+
+    return load_plugin(entry) if entry else None
+
+
 def get_supported_outlets(
-    command_only=False, matches_url=False, matches_embed_pattern=False
+    command_only=False, matches_url=False, matches_embed_pattern=False, netloc=None
 ):
     matched_plugins = []
 
-    # build a list of plugins with the requested features
-    for plugin in plugins:
-        if command_only and not plugin.command:
+    # build a list of plugins with the requested features, importing only the
+    # modules of the plugins that are selected
+    for entry in get_manifest():
+        if command_only and not entry["command"]:
             continue
-        # detects whether a plugin has implemented matches_url as a @classmethod
-        if matches_url and (
-            getattr(plugin.matches_url, "__func__")
-            is getattr(__bd.matches_url, "__func__")
-        ):
+        if matches_url and not entry["matches_url"]:
             continue
-        if matches_embed_pattern and (
-            (
-                getattr(plugin.matches_embed_pattern, "__func__")
-                is getattr(__bd.matches_embed_pattern, "__func__")
-            )
-            or ("matches_embed_pattern" not in plugin.__dict__)
+        # plugins without hints are always candidates for a given netloc
+        if (
+            netloc is not None
+            and entry["netloc_hints"]
+            and not any(hint in netloc for hint in entry["netloc_hints"])
         ):
             continue
-        matched_plugins.append(plugin)
+        if matches_embed_pattern and not entry["matches_embed_pattern"]:
+            continue
+        matched_plugins.append(load_plugin(entry))
     return matched_plugins
 
 
 def get_help_text_formatted_list():
     text = ""
-    for d in sorted(
-        get_supported_outlets(command_only=True), key=lambda x: x.outlet.lower()
+    for entry in sorted(
+        (e for e in get_manifest() if e["command"]),
+        key=lambda e: e["outlet"].lower(),
     ):
-        text += "{:<5} {}\n".format(d.command, d.outlet)
+        text += "{:<5} {}\n".format(entry["command"], entry["outlet"])
 
     return text
 
@@ -149,15 +367,36 @@ def main():
 
     parser.add_argument(
         "source",
-        nargs="?",
+        nargs="*",
         help=textwrap.dedent("""\
                                 specify a URL or a keyword to select an
                                 outlet from which to download a puzzle.
+                                Provide several to download them all, or
+                                use the keyword 'all' for every outlet.
 
                                 Supported outlet keywords are:\n""")
         + "{}".format(get_help_text_formatted_list()),
     )
 
+    parser.add_argument(
+        "-b",
+        "--batch",
+        help=textwrap.dedent("""\
+                            file listing URLs or keywords to download,
+                            one per line"""),
+        default=None,
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help=textwrap.dedent(f"""\
+                            maximum number of puzzles to download at once
+                            when downloading several (default: {DEFAULT_BATCH_WORKERS})"""),
+        type=int,
+        default=DEFAULT_BATCH_WORKERS,
+    )
+
     selector = parser.add_mutually_exclusive_group()
 
     selector.add_argument(
@@ -174,6 +413,22 @@ def main():
         "-d", "--date", help="a specific puzzle date to select", default=None
     )
 
+    selector.add_argument(
+        "--from",
+        dest="date_from",
+        help=textwrap.dedent("""\
+                                the first date of a range of puzzles to select
+                                (use with --to, or the range ends today)"""),
+        default=None,
+    )
+
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        help="the last date of a range of puzzles to select",
+        default=None,
+    )
+
     parser.add_argument(
         "-a",
         "--authenticate",
@@ -232,17 +487,22 @@ def main():
     )
 
     args = parser.parse_args()
-    if args.authenticate and args.source:
-        selected_downloader = next(
-            (
-                d
-                for d in get_supported_outlets(command_only=True)
-                if d.command == args.source
-            ),
-            None,
-        )
+
+    sources = list(args.source)
+    if args.batch:
+        try:
+            sources.extend(read_batch_file(args.batch))
+        except XWordDLException as e:
+            sys.exit(str(e))
+    sources = expand_sources(sources)
+
+    if args.authenticate and len(sources) > 1:
+        sys.exit("Authentication flag must use a single puzzle outlet keyword.")
+
+    elif args.authenticate and sources:
+        selected_downloader = get_plugin_by_command(sources[0])
         if selected_downloader is None:
-            raise XWordDLException("Keyword {} not recognized.".format(args.source))
+            raise XWordDLException("Keyword {} not recognized.".format(sources[0]))
 
         try:
             selected_downloader.authenticate(args.username, args.password)
@@ -256,9 +516,26 @@ def main():
     elif args.authenticate:
         sys.exit("Authentication flag must use a puzzle outlet keyword.")
 
-    if not args.source:
+    if not sources:
         sys.exit(parser.format_help())
 
+    if args.jobs < 1:
+        sys.exit("Number of jobs must be at least 1.")
+
+    dates = None
+    if args.date_to and not args.date_from:
+        sys.exit("The --to flag must be used with --from.")
+    elif args.date_from:
+        if any(source.startswith("http") for source in sources):
+            sys.exit("Date ranges can only be used with outlet keywords.")
+        try:
+            dates = date_range(
+                parse_date_or_exit(args.date_from),
+                parse_date_or_exit(args.date_to or "today"),
+            )
+        except XWordDLException as e:
+            sys.exit(str(e))
+
     options = {}
     if args.username:
         options["username"] = args.username
@@ -278,22 +555,32 @@ def main():
             sys.exit("Settings object not valid JSON.")
         options.update(settings)
 
+    if len(sources) > 1 or dates is not None:
+        if args.output == "-":
+            sys.exit("Cannot write more than one puzzle to standard output.")
+
+        results = download_batch(sources, dates=dates, max_workers=args.jobs, **options)
+        failures = sorted(label for label, error in results.items() if error)
+
+        if failures:
+            sys.exit(
+                "{} of {} downloads failed: {}".format(
+                    len(failures), len(results), ", ".join(failures)
+                )
+            )
+
+        return
+
     try:
-        if args.source.startswith("http"):
-            puzzle, filename = by_url(args.source, **options)
+        # specialcase the output file '-'
+        if args.output == "-":
+            puzzle, _ = by_source(sources[0], **options)
+            sys.stdout.buffer.write(puzzle.tobytes())
         else:
-            puzzle, filename = by_keyword(args.source, **options)
+            download_and_save(sources[0], **options)
     except XWordDLException as e:
         sys.exit(str(e))
 
-    # specialcase the output file '-'
-    if args.output == "-":
-        sys.stdout.buffer.write(puzzle.tobytes())
-    else:
-        if not filename.endswith(".puz"):
-            filename = filename + ".puz"
-        save_puzzle(puzzle, filename)
-
 
 if __name__ == "__main__":
     main()